@@ -0,0 +1,154 @@
+DEFAULT_CHUNK_SIZE = 1 << 16  # Bytes per read/write on file-like objects
+
+ACC_BITS = 64  # Accumulator is flushed/refilled by whole 64-bit words
+
+
+def elias_code(length):
+    """Elias length code of LZSS as (value, bit count)"""
+    if length == 1:
+        return 0, 1
+
+    l3_total_len = length.bit_length()
+    l2_total_len = l3_total_len.bit_length()
+
+    # unar(| bin'(|bin'|)| + 2)
+    code = ((1 << (l2_total_len + 2)) - 1) << 1
+    # bin'(|bin'|)
+    code = (code << (l2_total_len - 1)) | (l3_total_len & ((1 << (l2_total_len - 1)) - 1))
+    # bin'()
+    code = (code << (l3_total_len - 1)) | (length & ((1 << (l3_total_len - 1)) - 1))
+
+    return code, 2 * l2_total_len + l3_total_len + 1
+
+
+class BitWriter:
+    """MSB-first bit packer, writes whole bytes to a binary file-like object.
+
+    Without dst the bytes stay in memory, see getvalue().
+    """
+
+    def __init__(self, dst=None, buffer_size=DEFAULT_CHUNK_SIZE):
+        self.dst = dst
+        self.buffer_size = buffer_size
+        self.bits_written = 0
+
+        self._acc = 0
+        self._acc_len = 0
+        self._buffer = bytearray()
+
+    def write(self, value, bits):
+        acc = (self._acc << bits) | value
+        acc_len = self._acc_len + bits
+        self.bits_written += bits
+
+        while acc_len >= ACC_BITS:
+            acc_len -= ACC_BITS
+            self._buffer += (acc >> acc_len).to_bytes(ACC_BITS // 8, "big")
+            acc &= (1 << acc_len) - 1
+
+            if self.dst is not None and len(self._buffer) >= self.buffer_size:
+                self.dst.write(self._buffer)
+                self._buffer.clear()
+
+        self._acc = acc
+        self._acc_len = acc_len
+
+    def write_elias(self, length):
+        self.write(*elias_code(length))
+
+    def flush(self):
+        # Pad the tail with zero bits up to a whole byte
+        pad = -self._acc_len % 8
+        tail_len = (self._acc_len + pad) // 8
+        self._buffer += (self._acc << pad).to_bytes(tail_len, "big")
+        self._acc = 0
+        self._acc_len = 0
+
+        if self.dst is not None:
+            self.dst.write(self._buffer)
+            self._buffer.clear()
+
+    def getvalue(self):
+        # In-memory mode only: padded bytes, real length is bits_written
+        self.flush()
+        return bytes(self._buffer)
+
+
+class BitReader:
+    """MSB-first bit reader over a binary file-like object.
+
+    `bit_len` stops reading before the zero padding of a known-length stream.
+    """
+
+    def __init__(self, src, chunk_size=DEFAULT_CHUNK_SIZE, bit_len=None):
+        self.src = src
+        self.chunk_size = chunk_size
+        self._bits_left = bit_len
+
+        self._acc = 0
+        self._acc_len = 0
+        self._chunk = b""
+        self._chunk_pos = 0
+        self._eof = False
+
+    def _refill(self):
+        need = (ACC_BITS - self._acc_len) // 8
+        if self._chunk_pos + need > len(self._chunk) and not self._eof:
+            data = self.src.read(self.chunk_size)
+            if not data:
+                self._eof = True
+            self._chunk = self._chunk[self._chunk_pos :] + data
+            self._chunk_pos = 0
+
+        taken = self._chunk[self._chunk_pos : self._chunk_pos + need]
+        self._chunk_pos += len(taken)
+        self._acc = (self._acc << (8 * len(taken))) | int.from_bytes(taken, "big")
+        self._acc_len += 8 * len(taken)
+
+    @classmethod
+    def from_bytes(cls, data, bit_len=None):
+        reader = cls(None, bit_len=bit_len)
+        reader._chunk = bytes(data)
+        reader._eof = True
+        return reader
+
+    def can_read(self, bits):
+        if self._bits_left is not None and bits > self._bits_left:
+            return False
+
+        while self._acc_len < bits:
+            acc_len = self._acc_len
+            self._refill()
+            if self._acc_len == acc_len:
+                return False
+        return True
+
+    def read(self, bits):
+        if bits > ACC_BITS - 8:
+            # Wider than one refill - split in two
+            low_bits = ACC_BITS // 2
+            return (self.read(bits - low_bits) << low_bits) | self.read(low_bits)
+
+        if bits > self._acc_len or self._bits_left is not None:
+            if not self.can_read(bits):
+                raise EOFError(f"Need {bits} bits, stream is shorter")
+
+            if self._bits_left is not None:
+                self._bits_left -= bits
+
+        self._acc_len -= bits
+        value = self._acc >> self._acc_len
+        self._acc &= (1 << self._acc_len) - 1
+        return value
+
+    def read_elias(self):
+        unary_len = 0
+        while self.read(1):
+            unary_len += 1
+
+        l2_total_len = unary_len - 2
+        if l2_total_len <= 0:
+            return 1
+
+        l3_total_len = (1 << (l2_total_len - 1)) | self.read(l2_total_len - 1)
+        return (1 << (l3_total_len - 1)) | self.read(l3_total_len - 1)
@@ -0,0 +1,245 @@
+import io
+import struct
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+from lz77 import LZ77
+from lzss import LZSS
+
+MAGIC = b"LZB1"
+VERSION = 1
+
+CODEC_IDS = {"lzss": 0, "lz77": 1}
+CODEC_NAMES = {codec_id: name for name, codec_id in CODEC_IDS.items()}
+
+FLAG_PRIMED = 0x01  # Block starts with the previous block's window as history
+
+# magic, version, codec, flags, window, look-ahead, block size, block count
+HEADER = struct.Struct(">4sBBBxIIII")
+# raw length, compressed length, crc32 of raw data
+BLOCK_ENTRY = struct.Struct(">III")
+
+DEFAULT_BLOCK_SIZE = 1 << 20
+DEFAULT_WINDOW = 1 << 15
+DEFAULT_LOOK_AHEAD = 258
+
+
+@lru_cache(maxsize=None)
+def _make_codec(codec, window, look_ahead, max_chain_depth=None):
+    # One coder per worker process and parameter set
+    if codec == "lzss":
+        return LZSS(window, look_ahead, max_chain_depth)
+    if codec == "lz77":
+        return LZ77(window, look_ahead, max_chain_depth)
+    raise ValueError(f"Unknown codec {codec!r}, expected one of {list(CODEC_IDS)}")
+
+
+def _compress_block(task):
+    codec, window, look_ahead, max_chain_depth, block, prefix = task
+    payload = _make_codec(codec, window, look_ahead, max_chain_depth).compress(
+        block, prefix
+    )
+    return payload, zlib.crc32(block)
+
+
+def _decompress_block(task):
+    codec, window, look_ahead, payload, size, prefix = task
+    coder = _make_codec(codec, window, look_ahead)
+    try:
+        if codec == "lz77":
+            return coder.decompress(payload, size, prefix)
+        return coder.decompress(payload, prefix)
+    except (EOFError, IndexError) as err:
+        raise ValueError("Block payload is corrupted") from err
+
+
+def _run(func, tasks, workers):
+    if workers == 1 or len(tasks) <= 1:
+        return [func(task) for task in tasks]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(func, tasks, chunksize=1))
+
+
+def compress_blocks(
+    data: bytes,
+    codec="lzss",
+    block_size=DEFAULT_BLOCK_SIZE,
+    window=DEFAULT_WINDOW,
+    look_ahead=DEFAULT_LOOK_AHEAD,
+    primed=False,
+    max_chain_depth=None,
+    workers=None,
+):
+    """Compress independent blocks across a process pool into a framed container.
+
+    Layout: header, block index (raw length, payload length, crc32 per block),
+    then the payloads back to back. With `primed` every block may reference the
+    previous block's last `window` bytes - better ratio, but decode becomes
+    sequential.
+    """
+    if codec not in CODEC_IDS:
+        raise ValueError(f"Unknown codec {codec!r}, expected one of {list(CODEC_IDS)}")
+
+    tasks = []
+    for start in range(0, len(data), block_size):
+        prefix = data[max(0, start - window) : start] if primed else b""
+        block = data[start : start + block_size]
+        tasks.append((codec, window, look_ahead, max_chain_depth, block, prefix))
+
+    results = _run(_compress_block, tasks, workers)
+
+    out = io.BytesIO()
+    out.write(
+        HEADER.pack(
+            MAGIC,
+            VERSION,
+            CODEC_IDS[codec],
+            FLAG_PRIMED if primed else 0,
+            window,
+            look_ahead,
+            block_size,
+            len(tasks),
+        )
+    )
+    for task, (payload, crc) in zip(tasks, results):
+        out.write(BLOCK_ENTRY.pack(len(task[4]), len(payload), crc))
+    for payload, _ in results:
+        out.write(payload)
+
+    return out.getvalue()
+
+
+class BlockContainer:
+    """Header and block index of a container, payloads are read on demand.
+
+    `src` is a seekable binary file-like object, so single blocks can be read
+    without loading the whole container.
+    """
+
+    def __init__(self, src):
+        self.src = src
+
+        src.seek(0)
+        header = src.read(HEADER.size)
+        if len(header) < HEADER.size:
+            raise ValueError("Container is too short for a header")
+
+        (
+            magic,
+            version,
+            codec_id,
+            self.flags,
+            self.window,
+            self.look_ahead,
+            self.block_size,
+            block_count,
+        ) = HEADER.unpack(header)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Not a block container: {magic!r} v{version}")
+        if codec_id not in CODEC_NAMES:
+            raise ValueError(f"Unknown codec id {codec_id}")
+        self.codec = CODEC_NAMES[codec_id]
+
+        index = src.read(BLOCK_ENTRY.size * block_count)
+        if len(index) < BLOCK_ENTRY.size * block_count:
+            raise ValueError("Container index is truncated")
+        self.entries = list(BLOCK_ENTRY.iter_unpack(index))
+
+        # Payload offsets from the start of the container
+        self.offsets = []
+        offset = HEADER.size + len(index)
+        for _, payload_len, _ in self.entries:
+            self.offsets.append(offset)
+            offset += payload_len
+
+    @property
+    def primed(self):
+        return bool(self.flags & FLAG_PRIMED)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def payload(self, block_no):
+        self.src.seek(self.offsets[block_no])
+        payload = self.src.read(self.entries[block_no][1])
+        if len(payload) < self.entries[block_no][1]:
+            raise ValueError(f"Block {block_no} payload is truncated")
+        return payload
+
+    def _task(self, block_no, prefix=b""):
+        size = self.entries[block_no][0]
+        return (
+            self.codec,
+            self.window,
+            self.look_ahead,
+            self.payload(block_no),
+            size,
+            prefix,
+        )
+
+    def _check(self, block_no, block):
+        size, _, crc = self.entries[block_no]
+        if len(block) != size or zlib.crc32(block) != crc:
+            raise ValueError(f"Block {block_no} is corrupted: checksum mismatch")
+        return block
+
+    def read_block(self, block_no):
+        if not self.primed:
+            return self._check(block_no, _decompress_block(self._task(block_no)))
+
+        # Primed block needs the window before it - decode the chain
+        history = b""
+        for prev_no in range(block_no + 1):
+            block = self._check(prev_no, _decompress_block(self._task(prev_no, history)))
+            history = (history + block)[-self.window :]
+        return block
+
+    def decompress_all(self, workers=None):
+        if self.primed:
+            blocks = []
+            history = b""
+            for block_no in range(len(self)):
+                block = self._check(
+                    block_no, _decompress_block(self._task(block_no, history))
+                )
+                blocks.append(block)
+                history = (history + block)[-self.window :]
+            return b"".join(blocks)
+
+        tasks = [self._task(block_no) for block_no in range(len(self))]
+        blocks = _run(_decompress_block, tasks, workers)
+        return b"".join(
+            self._check(block_no, block) for block_no, block in enumerate(blocks)
+        )
+
+
+def decompress_blocks(container: bytes, workers=None):
+    return BlockContainer(io.BytesIO(container)).decompress_all(workers)
+
+
+def read_block(container: bytes, block_no):
+    return BlockContainer(io.BytesIO(container)).read_block(block_no)
+
+
+if __name__ == "__main__":
+    import os
+    import time
+
+    sample = b"".join(
+        f"{i:08d} INFO worker-{i % 7} processed request in {i % 113} ms\n".encode()
+        for i in range(20_000)
+    )
+
+    for workers in (1, os.cpu_count()):
+        start = time.perf_counter()
+        packed = compress_blocks(sample, block_size=1 << 18, workers=workers)
+        elapsed = time.perf_counter() - start
+        print(
+            f"workers={workers}: {len(sample)} -> {len(packed)} bytes, "
+            f"{len(sample) / elapsed / 1e6:.2f} MB/s"
+        )
+
+    assert decompress_blocks(packed) == sample
+    print(f"Block 3: {read_block(packed, 3)[:60]!r}")
@@ -1,28 +1,25 @@
+from bit_io import BitReader, BitWriter
+from match_finder import HashChainMatchFinder
+
+BYTE_LEN = 8
+
+
 class LZ77:
-    def __init__(self, sb_size=256, lab_size=32):
+    def __init__(self, sb_size=256, lab_size=32, max_chain_depth=None):
         self.sb_size = sb_size
         self.lab_size = lab_size
+        self.max_chain_depth = max_chain_depth
 
-    def encode(self, input_str: str = "abrababratritigratri"):
+    def encode(self, input_str: str = "abrababratritigratri", start_pos=0):
         output_tuples = []
+        finder = HashChainMatchFinder(
+            input_str, self.sb_size, self.lab_size, self.max_chain_depth
+        )
 
-        curr_pos = 0
+        curr_pos = start_pos
         while curr_pos < len(input_str):
+            offset, comb_len = finder.find_longest_match(curr_pos)
 
-            found_idx = -1
-            comb_len = 0
-            search_buf: str = input_str[max(0, curr_pos - self.sb_size) : curr_pos]
-            for advance in range(1, self.lab_size + 1):
-                combination = input_str[curr_pos : curr_pos + advance]
-                res = search_buf.rfind(combination)
-                if res < 0:
-                    break
-
-                else:
-                    comb_len = len(combination)
-                    found_idx = res
-
-            offset = (len(search_buf) - found_idx) if found_idx != -1 else 0
             next_char_pos = curr_pos + comb_len
             next_char = (
                 input_str[next_char_pos] if next_char_pos < len(input_str) else ""
@@ -47,8 +44,45 @@ class LZ77:
 
         return output_str
 
+    def compress(self, data: bytes, prefix=b""):
+        """Pack (offset, length, next byte) tuples with fixed widths, prefix primes the window"""
+        prefix = prefix[-self.sb_size :]
+        offset_bits = self.sb_size.bit_length()
+        length_bits = self.lab_size.bit_length()
+
+        writer = BitWriter()
+        for offset, length, next_char in self.encode(prefix + data, len(prefix)):
+            writer.write(offset, offset_bits)
+            writer.write(length, length_bits)
+            # Last tuple may have no next byte, the block size tells the decoder
+            writer.write(next_char if next_char != "" else 0, BYTE_LEN)
+
+        return writer.getvalue()
+
+    def decompress(self, payload: bytes, size, prefix=b""):
+        prefix = prefix[-self.sb_size :]
+        offset_bits = self.sb_size.bit_length()
+        length_bits = self.lab_size.bit_length()
+
+        reader = BitReader.from_bytes(payload)
+        output = bytearray(prefix)
+        end_pos = len(prefix) + size
+        while len(output) < end_pos:
+            offset = reader.read(offset_bits)
+            length = reader.read(length_bits)
+            next_char = reader.read(BYTE_LEN)
+
+            # Matches never overlap the look-ahead, one slice copy is enough
+            offset_pos = len(output) - offset
+            output += output[offset_pos : offset_pos + length]
+            if len(output) < end_pos:
+                output.append(next_char)
+
+        return bytes(output[len(prefix) :])
+
 
-lz = LZ77()
-encoded = lz.encode()
+if __name__ == "__main__":
+    lz = LZ77()
+    encoded = lz.encode()
 
-print(lz.decode(encoded))
+    print(lz.decode(encoded))
@@ -1,219 +1,381 @@
+import io
 from math import log2, ceil
-from bitstring import BitArray, BitStream
-import pandas as pd
+from bitstring import BitArray
 
-BYTE_LEN = 8
-
-
-class LZSS:
-    def __init__(self, sb_size=64, lab_size=64):
-        self.search_buf_len = sb_size  # W, window size
-        self.offset_bits = ceil(log2(self.search_buf_len))
-        print(self.offset_bits)
+from bit_io import DEFAULT_CHUNK_SIZE, BitReader, BitWriter, elias_code
+from match_finder import HashChainMatchFinder
 
-        self.look_ahead_buf_len = lab_size
-
-    def _encode_length_by_elias(self, length: int) -> str:
-        if length == 1:
-            return "0b0"
-
-        # bin'()
-        full_bin_l3 = bin(length)[2:]
-        l3_part = full_bin_l3[1:]
-        l3_total_len = len(full_bin_l3)
-
-        # bin'(|bin'|)
-        full_bin_l2 = bin(l3_total_len)[2:]
-        l2_part = full_bin_l2[1:]
-        l2_total_len = len(full_bin_l2)
+BYTE_LEN = 8
+LITERAL_BITS = 1 + BYTE_LEN  # Flag and the byte
 
-        # unar(| bin'(|bin'|)| + 2)
-        l1_part = "1" * (l2_total_len + 2) + "0"
+PARSE_STRATEGIES = ("greedy", "lazy", "optimal")
 
-        return "0b" + l1_part + l2_part + l3_part
 
-    # def encode(self, input_sequence: str):
-    #     bit_stream = BitArray()
+class LZSSTrace:
+    """Step log of one LZSS encode, stored as raw int columns.
 
-    #     pos = 0
-    #     while pos < len(input_sequence):
-    #         search_buf: str = input_sequence[max(0, pos - self.search_buf_len) : pos]
+    Table strings are rendered only when rows/columns are asked for, pandas is
+    imported only by to_dataframe().
+    """
 
-    #         # Match return-params
-    #         match_length = 0
-    #         match_start_pos = -1
-    #         # Match search loop
-    #         for increment in range(1, self.look_ahead_buf_len + 1):
-    #             candidate = input_sequence[pos : pos + increment]
+    def __init__(self, input_sequence):
+        self.input_sequence = input_sequence
 
-    #             search_res = search_buf.rfind(candidate)
-    #             if search_res <= -1:
-    #                 break
+        self.positions = []
+        self.flags = []
+        self.distances = []  # d = offset - 1, -1 for literals
+        self.lengths = []  # 0 for literals
+        self.offset_bits = []
 
-    #             match_length = len(candidate)
-    #             match_start_pos = search_res
+    def __len__(self):
+        return len(self.positions)
 
-    #         # Assemble output bit-sequence
-    #         if match_length >= 2:
-    #             bit_stream.append("0b1")
-    #             offset = len(search_buf) - match_start_pos
-    #             bit_stream.append(f"uint:{self.offset_bits}={offset}")
+    def add_step(self, pos, flag, distance, length, offset_bits):
+        self.positions.append(pos)
+        self.flags.append(flag)
+        self.distances.append(distance)
+        self.lengths.append(length)
+        self.offset_bits.append(offset_bits)
 
-    #             length_bit = self._encode_length_by_elias(match_length)
-    #             bit_stream.append(length_bit)
+    def step_bits(self):
+        for flag, length, offset_bits in zip(self.flags, self.lengths, self.offset_bits):
+            yield 1 + offset_bits + elias_code(length)[1] if flag else LITERAL_BITS
 
-    #             pos += match_length
+    @property
+    def total_bits(self):
+        return sum(self.step_bits())
 
-    #         else:
-    #             bit_stream.append("0b0")
-    #             bit_stream.append(f"uint:{BYTE_LEN}={ord(input_sequence[pos])}")
-    #             pos += 1
+    def iter_rows(self):
+        steps = zip(
+            self.positions, self.flags, self.distances, self.lengths, self.offset_bits
+        )
+        for (pos, flag, d, length, offset_bits), bits in zip(steps, self.step_bits()):
+            if flag:
+                code, code_len = elias_code(length)
+                yield {
+                    "Symbol sequence": self.input_sequence[pos : pos + length],
+                    "Flag": 1,
+                    "d": f"{d}({pos})",
+                    "l": length,
+                    "Code sequence": (
+                        f"1 [{bin(d)[2:].zfill(offset_bits)}] |{code:0{code_len}b}|"
+                    ),
+                    "Bits": bits,
+                }
+            else:
+                char = self.input_sequence[pos]
+                char_code = char if isinstance(char, int) else ord(char)
+                yield {
+                    "Symbol sequence": char,
+                    "Flag": 0,
+                    "d": "-",
+                    "l": 0,
+                    "Code sequence": f"0 [{bin(char_code)[2:].zfill(BYTE_LEN)}]",
+                    "Bits": bits,
+                }
+
+    def columns(self):
+        table = {
+            "Symbol sequence": [],
+            "Flag": [],
+            "d": [],
+            "l": [],
+            "Code sequence": [],
+            "Bits": [],
+        }
+        for row in self.iter_rows():
+            for col, value in row.items():
+                table[col].append(value)
+
+        return table
+
+    def to_dataframe(self):
+        import pandas as pd
 
-    #     return bit_stream
+        # Generate DataFrame and Summary
+        df = pd.DataFrame(self.columns())
+        total_bits = df["Bits"].sum()
+        original_bits = len(self.input_sequence) * BYTE_LEN
 
-    def encode_with_table(self, input_sequence: str):
-        steps = []
-        bit_stream = BitArray()
+        summary_row = {col: "" for col in df.columns}
+        summary_row["Symbol sequence"] = "TOTAL"
+        summary_row["Bits"] = total_bits
+        if original_bits:
+            summary_row["Code sequence"] = (
+                f"Compression: {100 - (total_bits/original_bits*100):.2f}%"
+            )
 
-        pos = 0
-        while pos < len(input_sequence):
-            search_buf: str = input_sequence[max(0, pos - self.search_buf_len) : pos]
-
-            # Match return-params
-            match_length = 0
-            match_start_pos = -1
-            # Match search loop
-            for increment in range(1, self.look_ahead_buf_len + 1):
-                candidate = input_sequence[pos : pos + increment]
-
-                search_res = search_buf.rfind(candidate)
-                if search_res <= -1:
-                    break
+        return pd.concat([df, pd.DataFrame([summary_row])], ignore_index=True)
 
-                match_length = len(candidate)
-                match_start_pos = search_res
 
-            # Data for table step
-            step_data = {
-                "Symbol sequence": "",
-                "Flag": 0,
-                "d": "-",
-                "l": 0,
-                "Code sequence": "",
-                "Bits": 0,
-            }
+class LZSS:
+    def __init__(
+        self, sb_size=64, lab_size=64, max_chain_depth=None, parse_strategy="greedy"
+    ):
+        self.search_buf_len = sb_size  # W, window size
+        self.offset_bits = ceil(log2(self.search_buf_len))
 
-            effective_history_len = max(1, min(pos, self.search_buf_len))
-            current_offset_bits = ceil(log2(effective_history_len))
+        self.look_ahead_buf_len = lab_size
+        self.max_chain_depth = max_chain_depth  # None - exhaustive match search
+
+        if parse_strategy not in PARSE_STRATEGIES:
+            raise ValueError(
+                f"Unknown parse strategy {parse_strategy!r}, "
+                f"expected one of {PARSE_STRATEGIES}"
+            )
+        self.parse_strategy = parse_strategy
+
+    def _offset_bits_at(self, pos):
+        # ceil(log2(history len)) without float rounding for huge positions
+        return (max(1, min(pos, self.search_buf_len)) - 1).bit_length()
+
+    def _match_bits(self, pos, length):
+        return 1 + self._offset_bits_at(pos) + elias_code(length)[1]
+
+    # Parsers yield (pos, offset, length) tokens from pos to stop_pos, length 0 - literal
+
+    def _parse_greedy(self, finder, pos, stop_pos):
+        # Longest match wherever there is one
+        while pos < stop_pos:
+            offset, length = finder.find_longest_match(pos)
+            yield pos, offset, length
+            pos += length or 1
+
+    def _parse_lazy(self, finder, pos, stop_pos):
+        # One-step lazy: emit a literal first if that gives fewer bits per symbol
+        end_pos = finder.end_pos
+        match = finder.find_longest_match(pos)
+        while pos < stop_pos:
+            offset, length = match
+
+            if length:
+                next_match = (
+                    finder.find_longest_match(pos + 1) if pos + 1 < end_pos else (0, 0)
+                )
+                match_bits = self._match_bits(pos, length)
+                if next_match[1]:
+                    deferred_bits = LITERAL_BITS + self._match_bits(pos + 1, next_match[1])
+                    deferred_len = 1 + next_match[1]
+                else:
+                    deferred_bits = LITERAL_BITS
+                    deferred_len = 1
+
+                # match_bits / length <= deferred_bits / deferred_len
+                if match_bits * deferred_len <= deferred_bits * length:
+                    yield pos, offset, length
+                    pos += length
+                    if pos < stop_pos:
+                        match = finder.find_longest_match(pos)
+                    continue
+
+                yield pos, 0, 0
+                pos += 1
+                match = next_match
+                continue
+
+            yield pos, 0, 0
+            pos += 1
+            if pos < stop_pos:
+                match = finder.find_longest_match(pos)
+
+    def _parse_optimal(self, finder, pos, stop_pos):
+        # Minimal total bits by DP from the end, any prefix of the longest match is a match
+        count = stop_pos - pos
+        matches = [finder.find_longest_match(p) for p in range(pos, stop_pos)]
+        elias_bits = [0] + [
+            elias_code(length)[1] for length in range(1, self.look_ahead_buf_len + 1)
+        ]
+
+        cost = [0] * (count + 1)  # Bits needed to encode [pos + i, stop_pos)
+        choice = [0] * count
+        for i in range(count - 1, -1, -1):
+            best_cost = LITERAL_BITS + cost[i + 1]
+            best_len = 0
+
+            max_len = min(matches[i][1], count - i)
+            if max_len:
+                head_bits = 1 + self._offset_bits_at(pos + i)
+                for length in range(1, max_len + 1):
+                    length_cost = head_bits + elias_bits[length] + cost[i + length]
+                    if length_cost < best_cost:
+                        best_cost = length_cost
+                        best_len = length
+
+            cost[i] = best_cost
+            choice[i] = best_len
+
+        i = 0
+        while i < count:
+            length = choice[i]
+            yield pos + i, matches[i][0] if length else 0, length
+            i += length or 1
+
+    def _write_tokens(self, writer, finder, pos, stop_pos, trace=None):
+        parse = getattr(self, f"_parse_{self.parse_strategy}")
+        data = finder.data
+        base_pos = finder.base_pos
+
+        for pos, offset, match_length in parse(finder, pos, stop_pos):
+            current_offset_bits = self._offset_bits_at(pos)
 
             # Assemble output bit-sequence
             if match_length >= 1:
-                bit_stream.append("0b1")
-                offset = len(search_buf) - match_start_pos
-                
-                d_to_write = offset - 1
-                bit_stream.append(f"uint:{current_offset_bits}={d_to_write}")
-
-                # bit_stream.append(f"uint:{current_offset_bits}={offset}")
-
-                length_bit = self._encode_length_by_elias(match_length)
-                bit_stream.append(length_bit)
-
-                # Fill table data for match
-                step_data["Flag"] = 1
-                step_data["Symbol sequence"] = input_sequence[pos : pos + match_length]
-                step_data["d"] = f"{d_to_write}({pos})"
-                step_data["l"] = match_length
-                step_data["Code sequence"] = (
-                    f"1 [{bin(d_to_write)[2:].zfill(current_offset_bits)}] |{length_bit[2:]}|"
-                )
-                step_data["Bits"] = 1 + current_offset_bits + (len(length_bit) - 2)
+                writer.write(1, 1)
+                writer.write(offset - 1, current_offset_bits)
+                writer.write_elias(match_length)
+
+                if trace is not None:
+                    trace.add_step(pos, 1, offset - 1, match_length, current_offset_bits)
 
                 pos += match_length
 
             else:
-                bit_stream.append("0b0")
-                bit_stream.append(f"uint:{BYTE_LEN}={ord(input_sequence[pos])}")
+                # Flag 0 and the literal in one write
+                writer.write(data[pos - base_pos], LITERAL_BITS)
 
-                # Fill table data for literal
-                char = input_sequence[pos]
-                step_data["Flag"] = 0
-                step_data["Symbol sequence"] = char
-                step_data["Code sequence"] = f"0 [{bin(ord(char))[2:].zfill(BYTE_LEN)}]"
-                step_data["Bits"] = 1 + BYTE_LEN
+                if trace is not None:
+                    trace.add_step(pos, 0, -1, 0, current_offset_bits)
 
                 pos += 1
 
-            steps.append(step_data)
-
-        # Generate DataFrame and Summary
-        df = pd.DataFrame(steps)
-        total_bits = df["Bits"].sum()
-        original_bits = len(input_sequence) * BYTE_LEN
-
-        summary_row = {col: "" for col in df.columns}
-        summary_row["Symbol sequence"] = "TOTAL"
-        summary_row["Bits"] = total_bits
-        summary_row["Code sequence"] = (
-            f"Compression: {100 - (total_bits/original_bits*100):.2f}%"
+        return pos
+
+    def _encode_tokens(self, input_sequence, trace=None, start_pos=0):
+        if isinstance(input_sequence, str):
+            try:
+                symbols = input_sequence.encode("latin-1")
+            except UnicodeEncodeError as err:
+                raise ValueError(f"Symbols must fit in {BYTE_LEN} bits") from err
+        else:
+            symbols = input_sequence
+
+        writer = BitWriter()
+        finder = HashChainMatchFinder(
+            symbols,
+            self.search_buf_len,
+            self.look_ahead_buf_len,
+            self.max_chain_depth,
         )
+        self._write_tokens(writer, finder, start_pos, len(symbols), trace)
 
-        df = pd.concat([df, pd.DataFrame([summary_row])], ignore_index=True)
+        return writer
 
-        return bit_stream, df
+    def encode(self, input_sequence):
+        """Fast path: only the bitstream, no step log"""
+        writer = self._encode_tokens(input_sequence)
 
-    def _decode_length_by_elias(self, stream: BitStream):
-        unary_len = 0
-        while stream.read("bool"):
-            unary_len += 1
+        # bitstring only at the API edge
+        return BitArray(bytes=writer.getvalue(), length=writer.bits_written)
 
-        l2_total_len = unary_len - 2
-        if l2_total_len <= 0:
-            return 1
+    def encode_with_trace(self, input_sequence):
+        trace = LZSSTrace(input_sequence)
+        writer = self._encode_tokens(input_sequence, trace)
 
-        l3_bits = "1"
-        if l2_total_len > 1:
-            l3_bits += stream.read(f"bin:{l2_total_len - 1}")
-        l3_total_len = int(l3_bits, 2)
+        bit_stream = BitArray(bytes=writer.getvalue(), length=writer.bits_written)
+        return bit_stream, trace
 
-        final_bits = "1"
-        if l3_total_len > 1:
-            final_bits += stream.read(f"bin:{l3_total_len - 1}")
+    def encode_with_table(self, input_sequence: str):
+        bit_stream, trace = self.encode_with_trace(input_sequence)
+        return bit_stream, trace.to_dataframe()
+
+    def _decode_tokens(
+        self, reader: BitReader, dst, chunk_size=DEFAULT_CHUNK_SIZE, history=b""
+    ):
+        window = bytearray(history)  # Tail of the output, last W bytes are the history
+        skip = len(history)  # Priming bytes are not part of the output
+
+        pos = len(history)
+        while reader.can_read(1):
+            if reader.read(1):
+                offset = reader.read(self._offset_bits_at(pos)) + 1
+                match_length = reader.read_elias()
+
+                start_pos = len(window) - offset
+                if offset >= match_length:
+                    window += window[start_pos : start_pos + match_length]
+                else:
+                    for i in range(match_length):
+                        window.append(window[start_pos + i])
 
-        return int(final_bits, 2)
+                pos += match_length
 
-    def decode(self, code_sequence: BitArray):
-        decoded_sequence = ""
+            else:
+                # Zero padding of the last byte is shorter than a literal
+                if not reader.can_read(BYTE_LEN):
+                    break
+
+                window.append(reader.read(BYTE_LEN))
+                pos += 1
 
-        stream = BitStream(code_sequence)
-        while stream.pos < stream.len:
-            pos = len(decoded_sequence)
-            effective_history_len = max(1, min(pos, self.search_buf_len))
-            current_offset_bits = ceil(log2(effective_history_len))
-            if stream.read("bool"):
-                d_read = stream.read(f"uint:{current_offset_bits}")
-                offset = d_read + 1
+            if len(window) >= self.search_buf_len + chunk_size:
+                out_len = len(window) - self.search_buf_len
+                dst.write(window[min(skip, out_len) : out_len])
+                skip = max(0, skip - out_len)
+                del window[:out_len]
 
-                # offset = stream.read(f"uint:{current_offset_bits}")
-                match_length = self._decode_length_by_elias(stream)
+        dst.write(window[skip:])
+        return pos - len(history)
 
-                start_pos = len(decoded_sequence) - offset
-                for i in range(match_length):
-                    decoded_sequence += decoded_sequence[start_pos + i]
+    def decode(self, code_sequence: BitArray):
+        reader = BitReader.from_bytes(code_sequence.tobytes(), bit_len=code_sequence.len)
+        decoded = io.BytesIO()
+        self._decode_tokens(reader, decoded)
+
+        # Latin-1 maps bytes 0..255 to the same code points as chr()
+        return decoded.getvalue().decode("latin-1")
+
+    def compress(self, data: bytes, prefix=b""):
+        """Bytes to padded bytes, prefix primes the window and is not encoded"""
+        prefix = prefix[-self.search_buf_len :]
+        writer = self._encode_tokens(prefix + data, start_pos=len(prefix))
+        return writer.getvalue()
+
+    def decompress(self, payload: bytes, prefix=b""):
+        prefix = prefix[-self.search_buf_len :]
+        decoded = io.BytesIO()
+        self._decode_tokens(BitReader.from_bytes(payload), decoded, history=prefix)
+        return decoded.getvalue()
+
+    def encode_stream(self, src, dst, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Compress binary file-like src into dst, memory ~ window + chunk"""
+        writer = BitWriter(dst, buffer_size=chunk_size)
+        finder = HashChainMatchFinder(
+            b"", self.search_buf_len, self.look_ahead_buf_len, self.max_chain_depth
+        )
 
+        pos = 0
+        eof = False
+        while not eof:
+            chunk = src.read(chunk_size)
+            if chunk:
+                finder.append(chunk)
             else:
-                char_code = stream.read(f"uint:{BYTE_LEN}")
-                decoded_sequence += chr(char_code)
+                eof = True
+
+            # Until the end of input keep a full look-ahead buffer after pos,
+            # lazy parse peeks one position further
+            stop_pos = finder.end_pos
+            if not eof:
+                stop_pos -= self.look_ahead_buf_len + 1
+            if pos < stop_pos:
+                pos = self._write_tokens(writer, finder, pos, stop_pos)
+
+        writer.flush()
+        return pos
 
-        return decoded_sequence
+    def decode_stream(self, src, dst, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Decompress binary file-like src into dst, memory ~ window + chunk"""
+        reader = BitReader(src, chunk_size=chunk_size)
+        return self._decode_tokens(reader, dst, chunk_size)
 
 
-test = "IF_WE_CANNOT_DO_AS_WE_WOULD_WE_SHOULD_DO_AS_WE_CANLD_DO_AS_WE_CANLD_DO_AS_LD_DO_AS_WE_CANLD_DO_AS_WE_CANLD_DO_AS_WE_CANWE_CANLD_DO_AS_WE_CANLD_DO_AS_WE_CANLD_DO_AS_WE_CANLD_DO_AS_WE_CAN"
-test2 = "abrababr atritigratriritigratrabrtrari ratit patati"
+if __name__ == "__main__":
+    test = "IF_WE_CANNOT_DO_AS_WE_WOULD_WE_SHOULD_DO_AS_WE_CANLD_DO_AS_WE_CANLD_DO_AS_LD_DO_AS_WE_CANLD_DO_AS_WE_CANLD_DO_AS_WE_CANWE_CANLD_DO_AS_WE_CANLD_DO_AS_WE_CANLD_DO_AS_WE_CANLD_DO_AS_WE_CAN"
+    test2 = "abrababr atritigratriritigratrabrtrari ratit patati"
 
-lz = LZSS()
-encoded, lz_df = lz.encode_with_table(input_sequence=test)
-print(lz_df)
+    lz = LZSS()
+    encoded, lz_df = lz.encode_with_table(input_sequence=test)
+    print(lz_df)
 
-total_bits = lz_df["Bits"].sum()
-print(f"Encoded: {lz.decode(encoded)}")
+    total_bits = lz_df["Bits"].sum()
+    print(f"Encoded: {lz.decode(encoded)}")
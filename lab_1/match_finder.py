@@ -0,0 +1,131 @@
+HASHED_PREFIX_LEN = 3  # Shortest match found through the hash chains
+
+
+class HashChainMatchFinder:
+    """Longest-match search for LZ77-family encoders.
+
+    Gives the same answer as scanning the search buffer with `rfind` for every
+    look-ahead length: the longest prefix of data[pos:] that lies entirely inside
+    the last `window_size` symbols, nearest occurrence on ties.
+
+    Matches of 3+ symbols are found by walking hash chains of 3-symbol prefixes
+    (nearest first), shorter ones by the last position of every symbol/pair.
+    `max_chain_depth` caps how many chain candidates are checked per position,
+    None checks them all and keeps the output exact.
+
+    Positions are absolute. For streaming, `append` adds the next chunk and drops
+    everything that fell out of the window, `data[0]` is then at `base_pos`.
+    """
+
+    def __init__(self, data, window_size, max_match_len, max_chain_depth=None):
+        self.data = data
+        self.base_pos = 0
+        self.window_size = window_size
+        self.max_match_len = max_match_len
+        self.max_chain_depth = max_chain_depth
+
+        self._indexed_pos = 0  # Positions below are visible to find_longest_match
+
+        self._last_symbol = {}
+        self._last_pair = {}
+        self._chain_head = {}
+        # Ring of previous chain links, only links inside the window are ever read
+        self._chain_prev = [-1] * window_size
+
+    @property
+    def end_pos(self):
+        return self.base_pos + len(self.data)
+
+    def append(self, chunk):
+        # Keep the window behind the indexed position and whatever is not indexed yet
+        keep_from = max(
+            self.base_pos,
+            self._indexed_pos - max(self.window_size, HASHED_PREFIX_LEN),
+        )
+        self.data = self.data[keep_from - self.base_pos :] + chunk
+        self.base_pos = keep_from
+
+        # Forget positions nobody can reach anymore
+        for table in (self._last_symbol, self._last_pair, self._chain_head):
+            stale = [key for key, pos in table.items() if pos < keep_from]
+            for key in stale:
+                del table[key]
+
+    def _index_up_to(self, pos):
+        data = self.data
+        base = self.base_pos
+        for next_pos in range(self._indexed_pos + 1, pos + 1):
+            # Symbol/pair/prefix becomes usable once it ends before the current pos
+            idx = next_pos - base
+            self._last_symbol[data[idx - 1]] = next_pos - 1
+
+            if next_pos >= 2:
+                self._last_pair[data[idx - 2 : idx]] = next_pos - 2
+
+            start = next_pos - HASHED_PREFIX_LEN
+            if start >= 0:
+                key = data[idx - HASHED_PREFIX_LEN : idx]
+                self._chain_prev[start % self.window_size] = self._chain_head.get(key, -1)
+                self._chain_head[key] = start
+
+        self._indexed_pos = max(self._indexed_pos, pos)
+
+    def find_longest_match(self, pos):
+        """Return (offset, length) of the best match at pos, (0, 0) if none"""
+        self._index_up_to(pos)
+
+        data = self.data
+        base = self.base_pos
+        idx = pos - base
+        max_len = min(self.max_match_len, len(data) - idx)
+        window_start = pos - self.window_size
+
+        best_len = 0
+        best_start = -1
+
+        # 1. Long matches through the hash chain, nearest candidates first
+        if max_len >= HASHED_PREFIX_LEN:
+            candidate = self._chain_head.get(data[idx : idx + HASHED_PREFIX_LEN], -1)
+            depth = 0
+            while candidate >= window_start and candidate >= 0:
+                # Match must end inside the search buffer
+                limit = min(max_len, pos - candidate)
+                cand_idx = candidate - base
+                if limit > best_len and (
+                    best_len < HASHED_PREFIX_LEN
+                    or data[cand_idx + best_len] == data[idx + best_len]
+                ):
+                    length = HASHED_PREFIX_LEN
+                    while length < limit and data[cand_idx + length] == data[idx + length]:
+                        length += 1
+
+                    # Strictly longer only - keeps the nearest among equal lengths
+                    if length > best_len:
+                        best_len = length
+                        best_start = candidate
+                        if best_len == max_len:
+                            break
+
+                depth += 1
+                if self.max_chain_depth is not None and depth >= self.max_chain_depth:
+                    break
+
+                candidate = self._chain_prev[candidate % self.window_size]
+
+        # 2. Short matches by the last seen pair/symbol
+        if best_len == 0 and max_len >= 2:
+            candidate = self._last_pair.get(data[idx : idx + 2], -1)
+            if candidate >= window_start and candidate >= 0:
+                best_len = 2
+                best_start = candidate
+
+        if best_len == 0 and max_len >= 1:
+            candidate = self._last_symbol.get(data[idx], -1)
+            if candidate >= window_start and candidate >= 0:
+                best_len = 1
+                best_start = candidate
+
+        if best_len == 0:
+            return 0, 0
+
+        return pos - best_start, best_len
@@ -0,0 +1,56 @@
+import sys
+import time
+
+from lzss import LZSS, PARSE_STRATEGIES
+
+
+def compare_parse_strategies(
+    data: bytes,
+    sb_size=4096,
+    lab_size=64,
+    max_chain_depth=None,
+    strategies=PARSE_STRATEGIES,
+):
+    """Ratio and encode/decode throughput of every LZSS parse strategy on data"""
+    report = []
+    for strategy in strategies:
+        coder = LZSS(sb_size, lab_size, max_chain_depth, parse_strategy=strategy)
+
+        start = time.perf_counter()
+        payload = coder.compress(data)
+        encode_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        decoded = coder.decompress(payload)
+        decode_time = time.perf_counter() - start
+
+        if decoded != data:
+            raise RuntimeError(f"{strategy} parse did not round-trip")
+
+        report.append(
+            {
+                "strategy": strategy,
+                "compressed bytes": len(payload),
+                "ratio": len(payload) / len(data) if data else 0.0,
+                "encode MB/s": len(data) / encode_time / 1e6 if encode_time else 0.0,
+                "decode MB/s": len(data) / decode_time / 1e6 if decode_time else 0.0,
+            }
+        )
+
+    return report
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], "rb") as f:
+            sample = f.read()
+    else:
+        sample = b"IF_WE_CANNOT_DO_AS_WE_WOULD_WE_SHOULD_DO_AS_WE_CAN " * 2000
+
+    print(f"Input: {len(sample)} bytes")
+    for row in compare_parse_strategies(sample):
+        print(
+            f"{row['strategy']:>8}: {row['compressed bytes']:>9} bytes, "
+            f"ratio {row['ratio']:.4f}, "
+            f"encode {row['encode MB/s']:.2f} MB/s, decode {row['decode MB/s']:.2f} MB/s"
+        )
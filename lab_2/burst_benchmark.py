@@ -0,0 +1,86 @@
+import sys
+import time
+
+import numpy as np
+
+from bulk_hamming import BLOCK_CORRECTED, BLOCK_UNCORRECTABLE
+from interleaver import InterleavedHammingCodec
+
+
+def inject_errors(
+    stream: bytes, bit_error_rate=0.0, burst_rate=0.0, burst_len=8, seed=0
+):
+    """Flip independent bits with bit_error_rate and start solid bursts of
+    burst_len flipped bits with burst_rate per bit. Returns the damaged copy"""
+    rng = np.random.default_rng(seed)
+    bits = np.unpackbits(np.frombuffer(stream, dtype=np.uint8))
+    total_bits = len(bits)
+
+    flips = np.zeros(total_bits, dtype=np.uint8)
+    random_errors = rng.binomial(total_bits, bit_error_rate)
+    flips[rng.integers(0, total_bits, random_errors)] ^= 1
+
+    burst_starts = rng.integers(0, total_bits, rng.binomial(total_bits, burst_rate))
+    burst_bits = (burst_starts[:, None] + np.arange(burst_len)).ravel()
+    flips[burst_bits[burst_bits < total_bits]] = 1
+
+    return np.packbits(bits ^ flips).tobytes()
+
+
+def run_benchmark(
+    size=1 << 22,
+    data_bits_len=64,
+    secded=True,
+    depth=16,
+    bit_error_rate=1e-5,
+    burst_rate=1e-6,
+    burst_len=8,
+    seed=0,
+):
+    """Encode random data, damage the stream, decode and classify every block"""
+    codec = InterleavedHammingCodec(data_bits_len, secded, depth)
+    rng = np.random.default_rng(seed)
+    data = rng.integers(0, 256, size, dtype=np.uint8).tobytes()
+
+    start = time.perf_counter()
+    stream = codec.encode(data)
+    encode_time = time.perf_counter() - start
+
+    damaged = inject_errors(stream, bit_error_rate, burst_rate, burst_len, seed + 1)
+
+    start = time.perf_counter()
+    decoded, flags = codec.decode(damaged, len(data))
+    decode_time = time.perf_counter() - start
+
+    # Block-wise comparison, the last block may be short
+    block_bytes = codec.coder.data_bytes_len
+    pad = -len(data) % block_bytes
+    sent = np.frombuffer(data + bytes(pad), dtype=np.uint8).reshape(-1, block_bytes)
+    received = np.frombuffer(decoded + bytes(pad), dtype=np.uint8).reshape(
+        -1, block_bytes
+    )
+    wrong = (sent != received).any(axis=1)
+
+    detected = flags == BLOCK_UNCORRECTABLE
+    return {
+        "depth": depth,
+        "blocks": len(flags),
+        "corrected": int(np.count_nonzero((flags == BLOCK_CORRECTED) & ~wrong)),
+        "detected": int(np.count_nonzero(detected)),
+        "miscorrected": int(np.count_nonzero(wrong & ~detected)),
+        "encode MB/s": len(data) / encode_time / 1e6,
+        "decode MB/s": len(data) / decode_time / 1e6,
+    }
+
+
+if __name__ == "__main__":
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 1 << 22
+
+    for depth in (1, 8, 16, 64):
+        row = run_benchmark(size, depth=depth, bit_error_rate=1e-6, burst_rate=2e-6)
+        print(
+            f"depth {row['depth']:>3}: {row['blocks']} blocks, "
+            f"corrected {row['corrected']}, detected {row['detected']}, "
+            f"miscorrected {row['miscorrected']}, "
+            f"encode {row['encode MB/s']:.1f} MB/s, decode {row['decode MB/s']:.1f} MB/s"
+        )
@@ -4,13 +4,16 @@ from hamming_utils import (
     covered_data_bits_positions,
     evaluate_parity_bits_needed,
     is_power_of_two,
+    print_trace,
 )
 
 
-def encode_block(input_data: BitArray):
-    print(f"Sequence to encode: {input_data.bin}")
+def encode_block(input_data: BitArray, trace=None):
+    """`trace(event, **fields)` is called on every step, see print_trace"""
+    if trace is not None:
+        trace("encode_start", data=input_data.bin)
 
-    parity_bits = evaluate_parity_bits_needed(len(input_data))
+    parity_bits = evaluate_parity_bits_needed(len(input_data), trace)
     encoded_len = parity_bits + len(input_data)
 
     # Create code block for assembling
@@ -29,34 +32,40 @@ def encode_block(input_data: BitArray):
         # Get next 2^power
         parity_bit_pos = 1 << power
 
-        print(
-            f"Checking parity bit at position {parity_bit_pos}[{bin(parity_bit_pos)}] with py-index {parity_bit_pos - 1}"
-        )
+        if trace is not None:
+            trace("parity_check", parity_pos=parity_bit_pos, py_index=parity_bit_pos - 1)
+
         xor_parity_res = 0  # Gives bit-value to achieve parity
         for data_pos in covered_data_bits_positions(parity_bit_pos, encoded_len):
             python_index = data_pos - 1
             xor_parity_res ^= encoded[python_index]
-            print(
-                f"Data at pos {data_pos} is under current parity bit. Current XOR-result inference: {"odd" if xor_parity_res else "even"}"
-            )
+            if trace is not None:
+                trace(
+                    "parity_cover",
+                    data_pos=data_pos,
+                    inference="odd" if xor_parity_res else "even",
+                )
 
         if xor_parity_res:
-            print(
-                f"Final parity inference - odd. Inverting parity-bit to {xor_parity_res}"
-            )
             python_index = parity_bit_pos - 1
             encoded[python_index] = bool(xor_parity_res)
 
-        else:
-            print(f"Final parity inference - even. No invert needed")
-
-        print(f"Current encoded state: {encoded.bin}\n")
+        if trace is not None:
+            trace(
+                "parity_set",
+                parity_pos=parity_bit_pos,
+                inference="odd" if xor_parity_res else "even",
+                value=int(xor_parity_res),
+            )
+            trace("encode_state", encoded=encoded.bin)
 
     return encoded
 
 
-def decode_block(encoded: BitArray):
-    print(f"Sequence to decode: {encoded.bin}")
+def decode_block(encoded: BitArray, trace=None):
+    """`trace(event, **fields)` is called on every step, see print_trace"""
+    if trace is not None:
+        trace("decode_start", encoded=encoded.bin)
     encoded_len = len(encoded)
 
     # Find error position by XOR
@@ -67,25 +76,26 @@ def decode_block(encoded: BitArray):
         # XOR only position where data is True, because False doesn't affect parity
         if encoded[python_idx] == True:
             xor_syndrome ^= pos
-            print(
-                f"Data bit at position {pos}[{bin(pos)}] with py-index {python_idx} is True. Using XOR {bin(xor_syndrome)}"
-            )
+            if trace is not None:
+                trace(
+                    "syndrome_step", pos=pos, py_index=python_idx, syndrome=xor_syndrome
+                )
 
     if xor_syndrome > encoded_len:
-        print(
-            f"HAMMING: More than one error found - correction is impossible. Found position: {xor_syndrome}, python-index {xor_syndrome - 1}"
-        )
+        # More than one error - correction is impossible
+        if trace is not None:
+            trace("uncorrectable", pos=xor_syndrome, py_index=xor_syndrome - 1)
         return None
 
     elif xor_syndrome == 0:
-        print(f"HAMMING: No errors detected")
+        if trace is not None:
+            trace("no_error")
     else:
         # Correct error
         python_xor_syndrome = xor_syndrome - 1
         encoded.invert(python_xor_syndrome)
-        print(
-            f"HAMMING: Error found and corrected to {encoded[python_xor_syndrome]}. Found position: {xor_syndrome},  python-index {python_xor_syndrome}"
-        )
+        if trace is not None:
+            trace("corrected", pos=xor_syndrome, py_index=python_xor_syndrome)
 
     # Assemble decoded data
     decoded = BitArray()
@@ -99,14 +109,14 @@ def decode_block(encoded: BitArray):
 
 if __name__ == "__main__":
     # test = BitArray("0b0011000111")
-    # block_encoded = encode_block(test)
+    # block_encoded = encode_block(test, trace=print_trace)
 
     # Invert at python index, for hamming-count position use + 1
     # block_encoded.invert(3)
     # inverted: str = f"{block_encoded}"
     # print(f"Inverted encoded: {block_encoded.bin}")
 
-    block_decoded = decode_block(BitArray("0b111011011111000"))
+    block_decoded = decode_block(BitArray("0b111011011111000"), trace=print_trace)
     if block_decoded:
         print(f"Decoded block: {block_decoded.bin}")
 
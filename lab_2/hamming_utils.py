@@ -1,15 +1,66 @@
-def evaluate_parity_bits_needed(data_bits_num):
+# Messages of the trace events, see print_trace
+TRACE_FORMATS = {
+    "parity_step": "Step {step}: 2^{parity_bits} < {data_bits} + {parity_bits} + 1",
+    "parity_total": (
+        "Total len needed: {total_bits}. Data len: {data_bits}, "
+        "redundant len: {parity_bits}\n"
+    ),
+    "encode_start": "Sequence to encode: {data}",
+    "parity_check": (
+        "Checking parity bit at position {parity_pos}[{parity_pos:#b}] "
+        "with py-index {py_index}"
+    ),
+    "parity_cover": (
+        "Data at pos {data_pos} is under current parity bit. "
+        "Current XOR-result inference: {inference}"
+    ),
+    "parity_set": "Final parity inference - {inference}. Parity-bit value: {value}",
+    "encode_state": "Current encoded state: {encoded}\n",
+    "data_distributed": "Data bits distributed {encoded}, len with 0-pos parity {length}",
+    "parity_filled": "Parity bits filled {encoded}",
+    "total_parity": "Total parity res {parity}",
+    "decode_start": "Sequence to decode: {encoded}",
+    "syndrome_step": (
+        "Data bit at position {pos}[{pos:#b}] with py-index {py_index} is True. "
+        "Using XOR {syndrome:#b}"
+    ),
+    "syndrome": "Xor syndrome for decoding {syndrome}, {syndrome:0{width}b}-pos",
+    "no_error": "HAMMING: No errors detected",
+    "corrected": "HAMMING: Error found and corrected at position {pos}",
+    "uncorrectable": "HAMMING: Error position {pos} is outside the block",
+    "double_error": "SECDED: Double error detected",
+}
+
+
+def print_trace(event, **fields):
+    """Trace hook printing the lab's step-by-step messages"""
+    message = TRACE_FORMATS.get(event)
+    if message is None:
+        print(f"{event}: {fields}")
+    else:
+        print(message.format(**fields))
+
+
+def evaluate_parity_bits_needed(data_bits_num, trace=None):
     parity_bits_num = 0
     # (2^par ≥ data + par + 1)
     while 2**parity_bits_num < (data_bits_num + parity_bits_num + 1):
         parity_bits_num += 1
-        print(
-            f"Step {parity_bits_num}: 2^{parity_bits_num} < {data_bits_num} + {parity_bits_num} + 1"
-        )
+        if trace is not None:
+            trace(
+                "parity_step",
+                step=parity_bits_num,
+                parity_bits=parity_bits_num,
+                data_bits=data_bits_num,
+            )
 
-    print(
-        f"Total len needed: {parity_bits_num + data_bits_num}. Data len: {data_bits_num}, redundant len: {parity_bits_num}\n"
-    )
+    if trace is not None:
+        trace(
+            "parity_total",
+            total_bits=parity_bits_num + data_bits_num,
+            data_bits=data_bits_num,
+            parity_bits=parity_bits_num,
+        )
     return parity_bits_num
 
 
@@ -0,0 +1,66 @@
+import numpy as np
+
+from bulk_hamming import BulkHammingCoder
+
+DEFAULT_DEPTH = 16
+
+
+def interleave(code_bits, depth):
+    """(blocks, n) bits -> transmit order, blocks a multiple of depth.
+
+    Every group of `depth` codewords is sent column by column: bit 0 of each
+    codeword, then bit 1, ... A burst of up to `depth` bits then hits each
+    codeword of the group at most once.
+    """
+    blocks, code_len = code_bits.shape
+    return (
+        code_bits.reshape(blocks // depth, depth, code_len).transpose(0, 2, 1).ravel()
+    )
+
+
+def deinterleave(stream_bits, depth, code_len):
+    groups = stream_bits.reshape(-1, code_len, depth)
+    return groups.transpose(0, 2, 1).reshape(-1, code_len)
+
+
+class InterleavedHammingCodec:
+    """BulkHammingCoder codewords interleaved to depth `depth` for burst channels.
+
+    The transmit buffer is the interleaved codeword bits packed MSB-first, the
+    block count is padded with zero words to a multiple of the depth.
+    """
+
+    def __init__(self, data_bits_len=64, secded=True, depth=DEFAULT_DEPTH):
+        if depth <= 0:
+            raise ValueError(f"Interleaving depth must be positive, got {depth}")
+
+        self.depth = depth
+        self.coder = BulkHammingCoder(data_bits_len, secded)
+
+    def blocks_for(self, data_len):
+        blocks = self.coder.blocks_for(data_len)
+        return -(-blocks // self.depth) * self.depth
+
+    def stream_bits_for(self, data_len):
+        return self.blocks_for(data_len) * self.coder.code_bits_len
+
+    def encode(self, data: bytes):
+        data_bytes_len = self.coder.data_bytes_len
+        padded = bytes(data) + bytes(
+            self.blocks_for(len(data)) * data_bytes_len - len(data)
+        )
+
+        encoded = self.coder.encode_buffer(padded)
+        code_bits = np.unpackbits(encoded, axis=1)[:, : self.coder.code_bits_len]
+        return np.packbits(interleave(code_bits, self.depth)).tobytes()
+
+    def decode(self, stream: bytes, data_len):
+        """Returns (data bytes, per-block flags) like BulkHammingCoder.decode_buffer"""
+        stream_bits = np.unpackbits(np.frombuffer(stream, dtype=np.uint8))
+        stream_bits = stream_bits[: self.stream_bits_for(data_len)]
+
+        code_bits = deinterleave(stream_bits, self.depth, self.coder.code_bits_len)
+        encoded = np.packbits(code_bits, axis=1)
+
+        data, flags = self.coder.decode_buffer(encoded, data_len)
+        return data, flags[: self.coder.blocks_for(data_len)]
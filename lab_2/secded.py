@@ -1,129 +1,204 @@
+from functools import lru_cache
+
 from bitstring import BitArray
 
+from hamming_utils import evaluate_parity_bits_needed, print_trace
 
-class HammingCoder:
-    def __init__(self, data_bits_len, secded=False) -> None:
+
+def _is_power_of_two(num):
+    return (num - 1) & num == 0
+
+
+class HammingTables:
+    """Position masks of one block size, shared by coders with the same parameters.
+
+    A block is handled as an int, position `pos` is bit `block_len - 1 - pos`
+    (MSB-first, the same as BitArray.uint).
+    """
+
+    def __init__(self, data_bits_len, secded):
         self.secded = secded
+        self.data_bits_len = data_bits_len
 
-        self._data_bits_num = data_bits_len
-        self._parity_bits_num = 0
+        self.parity_bits_num = evaluate_parity_bits_needed(data_bits_len)
+
+        self.block_len = data_bits_len + self.parity_bits_num + 1  # +1 for SECDED bit
+        self.code_bits_len = self.block_len if secded else self.block_len - 1
 
-        self._evaluate_parity_bits_needed()
+        # Data index -> position, and the same as runs of consecutive positions:
+        # (data shift, block shift, run mask) to move a whole run at once
+        self.data_positions = tuple(
+            pos for pos in range(3, self.block_len) if not _is_power_of_two(pos)
+        )
+        self.data_runs = []
+        data_idx = 0
+        while data_idx < data_bits_len:
+            run_start = self.data_positions[data_idx]
+            run_len = 1
+            while (
+                data_idx + run_len < data_bits_len
+                and self.data_positions[data_idx + run_len] == run_start + run_len
+            ):
+                run_len += 1
+
+            self.data_runs.append(
+                (
+                    data_bits_len - data_idx - run_len,
+                    self.block_len - run_start - run_len,
+                    (1 << run_len) - 1,
+                )
+            )
+            data_idx += run_len
+
+        # Parity bit 2^k: its own bit and the data positions it covers
+        self.parity_bits = []
+        self.parity_masks = []
+        self.check_masks = []
+        for power in range(self.parity_bits_num):
+            parity_bit_pos = 1 << power
+            covered = 0
+            for pos in self.data_positions:
+                if pos & parity_bit_pos:
+                    covered |= self._bit(pos)
+            self.parity_bits.append(self._bit(parity_bit_pos))
+            self.parity_masks.append(covered)
+            self.check_masks.append(covered | self._bit(parity_bit_pos))
+
+        # Syndrome -> bit to invert, None if the position is outside the block
+        self.syndrome_bits = [
+            self._bit(pos) if pos < self.block_len else None
+            for pos in range(1 << self.parity_bits_num)
+        ]
+
+    def _bit(self, pos):
+        return 1 << (self.block_len - 1 - pos)
+
+    def scatter(self, data):
+        block = 0
+        for data_shift, block_shift, run_mask in self.data_runs:
+            block |= ((data >> data_shift) & run_mask) << block_shift
+        return block
+
+    def gather(self, block):
+        data = 0
+        for data_shift, block_shift, run_mask in self.data_runs:
+            data |= ((block >> block_shift) & run_mask) << data_shift
+        return data
+
+    def syndrome(self, block):
+        xor_syndrome = 0
+        for power, check_mask in enumerate(self.check_masks):
+            xor_syndrome |= ((block & check_mask).bit_count() & 1) << power
+        return xor_syndrome
 
-        self._block_len = (
-            self._data_bits_num + self._parity_bits_num + 1
-        )  # +1 for SECDED feature
 
-        print(f"Data len: {data_bits_len}, redundant len: {self._parity_bits_num}\n")
+@lru_cache(maxsize=None)
+def hamming_tables(data_bits_len, secded=False):
+    return HammingTables(data_bits_len, secded)
 
-    def _evaluate_parity_bits_needed(self):
-        # (2^par ≥ data + par + 1)
-        while 2**self._parity_bits_num < (
-            self._data_bits_num + self._parity_bits_num + 1
-        ):
-            # Formatting the current state of the inequality
-            print(f"Step: 2^{self._parity_bits_num} < {self._data_bits_num} + {self._parity_bits_num} + 1")
 
-            self._parity_bits_num += 1
-        
-        print(f"Step: 2^{self._parity_bits_num} >= {self._data_bits_num} + {self._parity_bits_num} + 1\n")
+class HammingCoder:
+    """`trace(event, **fields)` hooks get every step when given, see print_trace"""
 
-    def _is_power_of_two(self, num):
-        return (num - 1) & num == 0
+    def __init__(self, data_bits_len, secded=False, trace=None) -> None:
+        self.secded = secded
 
-    def _covered_data_bits_positions(self, parity_bit):
-        for pos in range(3, self._block_len, 1):  # Start from '3' - the fist data pos
-            # Get data bit with current parity bit turned on
-            if not self._is_power_of_two(pos) and (pos & parity_bit):
-                yield pos
+        self._tables = hamming_tables(data_bits_len, secded)
+        if trace is not None:
+            evaluate_parity_bits_needed(data_bits_len, trace)  # Replay the steps
 
-    def encode_block(self, input_data: BitArray):
-        print(f"Input data: {input_data.bin}\n")
-        encoded = BitArray(self._block_len)
+        self._data_bits_num = data_bits_len
+        self._parity_bits_num = self._tables.parity_bits_num
+        self._block_len = self._tables.block_len  # +1 for SECDED feature
+
+    def encode_block(self, input_data: BitArray, trace=None):
+        if len(input_data) != self._data_bits_num:
+            raise ValueError(
+                f"Block has {len(input_data)} bits, expected {self._data_bits_num}"
+            )
+        if trace is not None:
+            trace("encode_start", data=input_data.bin)
+        tables = self._tables
 
         # Fill in the data bits
-        data_idx = 0
-        for pos in range(1, self._block_len):
-            if not self._is_power_of_two(pos):
-                encoded[pos] = input_data[data_idx]
-                data_idx += 1
-        
-        print(f"Data bits distributed {encoded.bin}, len with 0-pos parity {encoded.len} \n")
-
-        # Fill in parity bits
-        for power in range(self._parity_bits_num):
-            # Get next 2^power
-            parity_bit_pos = 1 << power
-
-            xor_parity_res = 0  # Gives bit-value to achieve parity
-            print(f"Checking parity for bit in pos {parity_bit_pos}\n")
-            for data_pos in self._covered_data_bits_positions(parity_bit_pos):
-                xor_parity_res ^= encoded[data_pos]
-                print(f"Data at pos {data_pos} is under parity bit {parity_bit_pos}. Xor result: {xor_parity_res}")
-            
-            print(f"Final XOR res for parity bit {parity_bit_pos}: {xor_parity_res}. State of encoded str is {encoded.bin}")
-            encoded[parity_bit_pos] = bool(xor_parity_res)
-            print()
+        encoded = tables.scatter(input_data.uint)
+        if trace is not None:
+            trace(
+                "data_distributed",
+                encoded=f"{encoded:0{self._block_len}b}",
+                length=self._block_len,
+            )
+
+        # Fill in parity bits - parity of the covered data under the mask
+        for power, parity_mask in enumerate(tables.parity_masks):
+            if (encoded & parity_mask).bit_count() & 1:
+                encoded |= tables.parity_bits[power]
+
+        if trace is not None:
+            trace("parity_filled", encoded=f"{encoded:0{self._block_len}b}")
 
         # SECDED check
         if self.secded:
-            total_parity = bool(encoded.count(True) % 2)
-            encoded[0] = total_parity
-            print(f"Total parity res {total_parity}\n")
-            return encoded
+            total_parity = encoded.bit_count() & 1
+            encoded |= total_parity << (self._block_len - 1)
+            if trace is not None:
+                trace("total_parity", parity=bool(total_parity))
+            return BitArray(uint=encoded, length=self._block_len)
         else:
-            return encoded[1:]
+            # Position 0 is the MSB and always 0 here
+            return BitArray(uint=encoded, length=self._block_len - 1)
+
+    def decode_block(self, encoded: BitArray, trace=None):
+        tables = self._tables
+        if len(encoded) != tables.code_bits_len:
+            raise ValueError(
+                f"Codeword has {len(encoded)} bits, expected {tables.code_bits_len}"
+            )
+        block = encoded.uint  # Without SECDED the missing 0-pos is a leading 0
+        if trace is not None:
+            data_part = block & ((1 << (self._block_len - 1)) - 1)  # Without 0-pos
+            trace("decode_start", encoded=f"{data_part:0{self._block_len - 1}b}")
 
-    def decode_block(self, encoded: BitArray):
-        encoded = (
-            encoded if self.secded else (BitArray([0]) + encoded)
-        )  # For easy indexing
-        print(f"Inverted encoded block: {encoded[1:].bin}")
-
-
-        width = self._parity_bits_num
-        
         # Find error position
-        xor_syndrome = 0
-        for pos in range(1, len(encoded)):
-            if encoded[pos] == True:
-                xor_syndrome ^= pos
-                print(f"Pos {pos:2} (1) -> New syndrome: {xor_syndrome:0{width}b} ({xor_syndrome})")
+        xor_syndrome = tables.syndrome(block)
+        if trace is not None:
+            trace("syndrome", syndrome=xor_syndrome, width=self._parity_bits_num)
 
-        print(f"Xor syndrome for decoding {xor_syndrome}, {xor_syndrome:0{width}b}-pos")
+        overall_error = block.bit_count() & 1
 
-        overall_error = encoded.count(True) % 2
-
-        
         if xor_syndrome != 0:
             if self.secded and not overall_error:
-                print("SECDED: Double error detected")
+                if trace is not None:
+                    trace("double_error")
+                return None
+
+            error_bit = tables.syndrome_bits[xor_syndrome]
+            if error_bit is None:
+                if trace is not None:
+                    trace("uncorrectable", pos=xor_syndrome)
                 return None
 
-            else:
-                encoded.invert(xor_syndrome)
-                print(f"HAMMING: Error found and corrected at position {xor_syndrome}")
+            block ^= error_bit
+            if trace is not None:
+                trace("corrected", pos=xor_syndrome)
 
-        output_data = BitArray()
-        for pos in range(1, self._block_len):
-            if not self._is_power_of_two(pos):
-                output_data.append([encoded[pos]])
+        elif trace is not None:
+            trace("no_error")
 
-        return output_data
+        return BitArray(uint=tables.gather(block), length=self._data_bits_num)
 
 
 if __name__ == "__main__":
     test = BitArray("0b11000111001100000110001110000110001110110001110011100")
 
-    coder = HammingCoder(data_bits_len=len(test), secded=False)
-    
+    coder = HammingCoder(data_bits_len=len(test), secded=False, trace=print_trace)
 
-    block_encoded = coder.encode_block(test)
+    block_encoded = coder.encode_block(test, trace=print_trace)
     print(f"Original encoded block: {block_encoded.bin}")
 
     block_encoded.invert(37)
     # block_encoded.invert(7
 
-    block_decoded = coder.decode_block(block_encoded)
+    block_decoded = coder.decode_block(block_encoded, trace=print_trace)
     if block_decoded:
         print(f"Decoded block: {block_decoded.bin}")
@@ -20,5 +20,136 @@ def mod_bin_exp(base, power, mod):
     return res
 
 
+RECODINGS = ("sliding", "fixed")
+
+
+def choose_window_size(power_bits):
+    # Table size 2^(k-1) against ~bits/(k+1) multiplications
+    for min_bits, window in ((672, 6), (240, 5), (80, 4), (24, 3)):
+        if power_bits >= min_bits:
+            return window
+    return 1
+
+
+def _sliding_window_exp(base, power, window, mul, one):
+    # Odd powers base^1, base^3, ..., base^(2^window - 1)
+    odd_powers = [base]
+    if window > 1:
+        base_sqr = mul(base, base)
+        for _ in range((1 << (window - 1)) - 1):
+            odd_powers.append(mul(odd_powers[-1], base_sqr))
+
+    res = one
+    bit = power.bit_length() - 1
+    while bit >= 0:
+        if not (power >> bit) & 1:
+            res = mul(res, res)
+            bit -= 1
+            continue
+
+        # Longest window of at most `window` bits that ends with a 1
+        low = max(bit - window + 1, 0)
+        while not (power >> low) & 1:
+            low += 1
+        width = bit - low + 1
+
+        for _ in range(width):
+            res = mul(res, res)
+        res = mul(res, odd_powers[((power >> low) & ((1 << width) - 1)) >> 1])
+        bit = low - 1
+
+    return res
+
+
+def _fixed_window_exp(base, power, window, mul, one):
+    # All powers base^0 .. base^(2^window - 1), one multiplication per digit
+    powers = [one, base]
+    for _ in range((1 << window) - 2):
+        powers.append(mul(powers[-1], base))
+
+    res = one
+    digit_mask = (1 << window) - 1
+    top_shift = -(-power.bit_length() // window) * window
+    for shift in range(top_shift - window, -1, -window):
+        for _ in range(window):
+            res = mul(res, res)
+        digit = (power >> shift) & digit_mask
+        if digit:
+            res = mul(res, powers[digit])
+
+    return res
+
+
+class ModExpContext:
+    """Modular exponentiation by one modulus, Montgomery constants computed once.
+
+    Exponents are recoded into sliding (odd powers only) or fixed k-ary windows.
+    With `montgomery` (odd modulus only) products stay in Montgomery form and
+    are reduced by shifts and masks instead of `%` on the double-width product.
+    In CPython that is slower than plain `%` (the REDC steps are extra big-int
+    operations), so it is off by default and kept for comparison only.
+    """
+
+    def __init__(self, mod, montgomery=False, recoding="sliding", window=None):
+        if mod <= 0:
+            raise ValueError(f"Modulus must be positive, got {mod}")
+        if recoding not in RECODINGS:
+            raise ValueError(
+                f"Unknown recoding {recoding!r}, expected one of {RECODINGS}"
+            )
+        if montgomery and not mod & 1:
+            raise ValueError("Montgomery reduction needs an odd modulus")
+
+        self.mod = mod
+        self.montgomery = montgomery
+        self.recoding = recoding
+        self.window = window
+
+        if montgomery:
+            # R = 2^r_bits > mod, mod_inv_neg = -mod^-1 (mod R)
+            self.r_bits = mod.bit_length()
+            self.r_mask = (1 << self.r_bits) - 1
+            self.mod_inv_neg = -pow(mod, -1, 1 << self.r_bits) & self.r_mask
+            self.r_sqr = (1 << (2 * self.r_bits)) % mod
+            self.one = (1 << self.r_bits) % mod
+
+    def _mont_mul(self, a, b):
+        # REDC: t + m*mod is divisible by R, so the division is a shift
+        t = a * b
+        m = ((t & self.r_mask) * self.mod_inv_neg) & self.r_mask
+        t = (t + m * self.mod) >> self.r_bits
+        return t - self.mod if t >= self.mod else t
+
+    def to_montgomery(self, num):
+        return self._mont_mul(num % self.mod, self.r_sqr)
+
+    def from_montgomery(self, num):
+        return self._mont_mul(num, 1)
+
+    def pow(self, base, power):
+        if power < 0:
+            raise ValueError("Negative exponents are not supported")
+        if self.mod == 1:
+            return 0
+        if power == 0:
+            return 1
+
+        mod = self.mod
+        window = self.window or choose_window_size(power.bit_length())
+        exp = _sliding_window_exp if self.recoding == "sliding" else _fixed_window_exp
+
+        if not self.montgomery:
+            return exp(base % mod, power, window, lambda a, b: a * b % mod, 1)
+
+        res = exp(self.to_montgomery(base), power, window, self._mont_mul, self.one)
+        return self.from_montgomery(res)
+
+
+def mod_exp(base, power, mod):
+    """Sliding-window base^power % mod, a throwaway context without Montgomery"""
+    return ModExpContext(mod).pow(base, power)
+
+
 if __name__ == "__main__":
     print(bin_exp(24, 3))
+    print(mod_exp(24, 65537, 1_000_003), pow(24, 65537, 1_000_003))
@@ -1,8 +1,37 @@
+from math import gcd
+
+LEHMER_DIGIT_BITS = 62  # Leading bits simulated per Lehmer step
+LEHMER_MIN_BITS = 3072  # extended_gcd switches to Lehmer above this size
+
+
 def get_gcd(a, b):
-    while a != 0:
-        b, a = a, b % a
+    # The C implementation beats any Python-level loop at every size
+    return gcd(a, b)
+
+
+def binary_gcd(a, b):
+    """Stein's GCD: shifts and subtractions only, trailing zeros removed at once.
+
+    Reference implementation - slower than get_gcd/math.gcd at every size in
+    CPython (see gcd_benchmark), so only the benchmark calls it.
+    """
+    a, b = abs(a), abs(b)
+    if a == 0:
+        return b
+    if b == 0:
+        return a
+
+    # Common power of two
+    shift = ((a | b) & -(a | b)).bit_length() - 1
+    a >>= (a & -a).bit_length() - 1
 
-    return b
+    while b != 0:
+        b >>= (b & -b).bit_length() - 1
+        if a > b:
+            a, b = b, a
+        b -= a
+
+    return a << shift
 
 
 def solve_extended_ea(a, b):
@@ -12,11 +41,108 @@ def solve_extended_ea(a, b):
     x_b, y_b = 0, 1
 
     while a != 0:
-        x_a, y_a, x_b, y_b = x_b - (b // a) * x_a, y_b - (b // a) * y_a, x_a, y_a
-        b, a = a, b % a
+        quotient, remainder = divmod(b, a)
+        x_a, x_b = x_b - quotient * x_a, x_a
+        y_a, y_b = y_b - quotient * y_a, y_a
+        b, a = a, remainder
 
     return b, x_b, y_b
 
 
+def lehmer_extended_gcd(a, b):
+    """Same result contract as solve_extended_ea: (g, x, y) with a*x + b*y = g.
+
+    Lehmer's method (Knuth, Algorithm L): runs Euclid on the leading
+    LEHMER_DIGIT_BITS bits while the quotients are provably the same as for the
+    full numbers, then applies the collected 2x2 matrix to the full numbers
+    once. Multi-thousand-bit inputs need far fewer big-int divisions.
+    """
+    swapped = a < b
+    if swapped:
+        a, b = b, a
+
+    # a = x_a * a0 + y_a * b0, b = x_b * a0 + y_b * b0
+    x_a, y_a, x_b, y_b = 1, 0, 0, 1
+
+    while b.bit_length() > LEHMER_DIGIT_BITS:
+        shift = a.bit_length() - LEHMER_DIGIT_BITS
+        a_hat, b_hat = a >> shift, b >> shift
+
+        # Single-precision Euclid, (A, B; C, D) collects its steps
+        m_a, m_b, m_c, m_d = 1, 0, 0, 1
+        while b_hat + m_c != 0 and b_hat + m_d != 0:
+            quotient = (a_hat + m_a) // (b_hat + m_c)
+            if quotient != (a_hat + m_b) // (b_hat + m_d):
+                break
+            m_a, m_c = m_c, m_a - quotient * m_c
+            m_b, m_d = m_d, m_b - quotient * m_d
+            a_hat, b_hat = b_hat, a_hat - quotient * b_hat
+
+        if m_b == 0:
+            # No quotient was certain - one full-precision step
+            quotient, remainder = divmod(a, b)
+            a, b = b, remainder
+            x_a, x_b = x_b, x_a - quotient * x_b
+            y_a, y_b = y_b, y_a - quotient * y_b
+        else:
+            a, b = m_a * a + m_b * b, m_c * a + m_d * b
+            x_a, x_b = m_a * x_a + m_b * x_b, m_c * x_a + m_d * x_b
+            y_a, y_b = m_a * y_a + m_b * y_b, m_c * y_a + m_d * y_b
+
+    # The rest fits a machine word
+    while b != 0:
+        quotient, remainder = divmod(a, b)
+        a, b = b, remainder
+        x_a, x_b = x_b, x_a - quotient * x_b
+        y_a, y_b = y_b, y_a - quotient * y_b
+
+    if swapped:
+        return a, y_a, x_a
+    return a, x_a, y_a
+
+
+def extended_gcd(a, b):
+    if max(a.bit_length(), b.bit_length()) > LEHMER_MIN_BITS:
+        return lehmer_extended_gcd(a, b)
+    return solve_extended_ea(a, b)
+
+
+def mod_inverse(a, mod):
+    gcd, x, _ = extended_gcd(a % mod, mod)
+    if gcd != 1:
+        raise ValueError(f"{a} is not invertible modulo {mod}, gcd = {gcd}")
+    return x % mod
+
+
+def batch_mod_inverse(values, mod):
+    """Inverses of all values modulo mod for one inversion and 3(n - 1) products.
+
+    Montgomery's trick: invert the product of all values, then peel the single
+    inverses off with the prefix products.
+    """
+    values = list(values)
+    if not values:
+        return []
+
+    # prefix[i] = values[0] * ... * values[i]
+    prefix = [values[0] % mod]
+    for value in values[1:]:
+        prefix.append(prefix[-1] * value % mod)
+
+    try:
+        inverse = mod_inverse(prefix[-1], mod)
+    except ValueError:
+        bad = next(value for value in values if get_gcd(value % mod, mod) != 1)
+        raise ValueError(f"{bad} is not invertible modulo {mod}") from None
+
+    inverses = [0] * len(values)
+    for i in range(len(values) - 1, 0, -1):
+        inverses[i] = inverse * prefix[i - 1] % mod
+        inverse = inverse * values[i] % mod
+    inverses[0] = inverse
+
+    return inverses
+
+
 if __name__ == "__main__":
     print(solve_extended_ea(196, 180))
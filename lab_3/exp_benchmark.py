@@ -0,0 +1,66 @@
+import secrets
+import sys
+import time
+
+from binary_exp import ModExpContext, mod_bin_exp
+
+BIT_SIZES = (1024, 2048, 4096)
+
+
+def _time_per_call(func, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        func()
+    return (time.perf_counter() - start) / repeats
+
+
+def benchmark_mod_exp(bit_sizes=BIT_SIZES, repeats=5):
+    """Milliseconds per full-size exponentiation, every engine against pow()"""
+    report = []
+    for bits in bit_sizes:
+        mod = secrets.randbits(bits) | (1 << (bits - 1)) | 1
+        base = secrets.randbelow(mod)
+        power = secrets.randbits(bits) | (1 << (bits - 1))
+
+        engines = {
+            "pow": lambda: pow(base, power, mod),
+            "mod_bin_exp": lambda: mod_bin_exp(base, power, mod),
+        }
+        for montgomery in (False, True):
+            for recoding in ("sliding", "fixed"):
+                ctx = ModExpContext(mod, montgomery, recoding)
+                name = f"{recoding}{' montgomery' if montgomery else ''}"
+                engines[name] = lambda ctx=ctx: ctx.pow(base, power)
+
+        expected = pow(base, power, mod)
+        for name, func in engines.items():
+            if func() != expected:
+                raise RuntimeError(f"{name} gave a wrong result at {bits} bits")
+            report.append(
+                {
+                    "bits": bits,
+                    "engine": name,
+                    "ms": _time_per_call(func, repeats) * 1e3,
+                }
+            )
+
+    return report
+
+
+if __name__ == "__main__":
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    report = benchmark_mod_exp(repeats=repeats)
+    baseline = {row["bits"]: row["ms"] for row in report if row["engine"] == "pow"}
+    for row in report:
+        print(
+            f"{row['bits']:>5} bits {row['engine']:>20}: {row['ms']:9.2f} ms "
+            f"({row['ms'] / baseline[row['bits']]:.2f}x pow)"
+        )
+
+    # Montgomery in pure Python against the plain `%` window it replaces
+    ms = {(row["bits"], row["engine"]): row["ms"] for row in report}
+    for bits in baseline:
+        ratio = ms[bits, "sliding montgomery"] / ms[bits, "sliding"]
+        verdict = "slower" if ratio > 1 else "faster"
+        print(f"{bits:>5} bits: Montgomery {ratio:.2f}x plain sliding ({verdict})")
@@ -0,0 +1,64 @@
+import math
+import random
+import sys
+import time
+
+from euclidean import (
+    batch_mod_inverse,
+    binary_gcd,
+    get_gcd,
+    lehmer_extended_gcd,
+    mod_inverse,
+    solve_extended_ea,
+)
+
+BIT_SIZES = (64, 256, 1024, 4096, 16384)
+BATCH_SIZE = 256
+
+
+def _time_per_call(func, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        func()
+    return (time.perf_counter() - start) / repeats
+
+
+def benchmark_gcd(bit_sizes=BIT_SIZES, repeats=20, seed=0):
+    """Microseconds per call of every GCD/inversion routine by operand size"""
+    rng = random.Random(seed)
+    report = []
+    for bits in bit_sizes:
+        a = rng.getrandbits(bits) | (1 << (bits - 1))
+        b = rng.getrandbits(bits) | (1 << (bits - 1))
+        mod = rng.getrandbits(bits) | (1 << (bits - 1)) | 1
+        values = [rng.randrange(1, mod) for _ in range(BATCH_SIZE)]
+        values = [value for value in values if math.gcd(value, mod) == 1]
+
+        routines = {
+            "math.gcd": lambda: math.gcd(a, b),
+            "get_gcd": lambda: get_gcd(a, b),
+            "binary_gcd": lambda: binary_gcd(a, b),
+            "solve_extended_ea": lambda: solve_extended_ea(a, b),
+            "lehmer_extended_gcd": lambda: lehmer_extended_gcd(a, b),
+            f"{len(values)} x mod_inverse": lambda: [
+                mod_inverse(value, mod) for value in values
+            ],
+            f"batch_mod_inverse({len(values)})": lambda: batch_mod_inverse(values, mod),
+        }
+        for name, func in routines.items():
+            report.append(
+                {
+                    "bits": bits,
+                    "routine": name,
+                    "us": _time_per_call(func, repeats) * 1e6,
+                }
+            )
+
+    return report
+
+
+if __name__ == "__main__":
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+    for row in benchmark_gcd(repeats=repeats):
+        print(f"{row['bits']:>6} bits {row['routine']:>26}: {row['us']:12.1f} us")
@@ -1,84 +1,191 @@
+import multiprocessing as mp
+import os
 import secrets
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from functools import lru_cache
+from math import isqrt
 
-from binary_exp import mod_bin_exp
+SEARCH_MODES = ("random", "incremental")
+DEFAULT_SIEVE_INTERVAL = 4096  # Odd numbers sieved per incremental start point
 
+_stop_event = None  # Set in search workers, tells them to give up
 
-class PrimeNumberGenerator:
-    def __init__(self, num_len=1024) -> None:
-        self.num_len = num_len
-        self._primes = self._generate_small_primes_by_sieve_of_eratosthenes()
-
-    def _generate_small_primes_by_sieve_of_eratosthenes(self, limit=1000):
-        prime_nums = []
-        raw_nums = [True] * (limit + 1)  # +1 for iterating from idx = 2
-        sqrt_limit = int(
-            limit**0.5
-        )  # truncate to achieve one of the factors <= sqrt(limit)
-
-        for num in range(2, limit + 1):
-            if raw_nums[num]:
-                # Get the prime number for output list
-                prime_nums.append(num)
-
-                # If all possible composites marked- continue filling the prime list
-                if num > sqrt_limit:
-                    continue
-
-                # Strike out composites for current prime
-                for comp_num in range(num**2, limit + 1, num):
-                    raw_nums[comp_num] = False
-
-        return prime_nums
-
-    def _is_prime_by_miller_rabin(self, odd_n, check_iters=40):
-        def factorize_by_powers_of_two(even_num):
-            d = even_num
-            s = 0
-            # Check if candidate num can be divided by 2
-            while not (d & 1):
-                d >>= 1  # Factorize by 2
-                s += 1
-
-            # Return max power of 2 and remaining odd factor 'd'
-            return s, d
-
-        power_s, odd_d = factorize_by_powers_of_two(odd_n - 1)
-
-        # Test n-candidate for primality
-        for _ in range(check_iters):
-            # Get random 'a-base from [2, n - 2]
-            a_base = secrets.randbelow(odd_n - 4) + 2
-
-            # Check odd start-number-'d'
-            mod_res = mod_bin_exp(a_base, odd_d, odd_n)
-            if mod_res == 1 or mod_res == odd_n - 1:
-                # 'n'-candidate passed check, all the other mod results will be = 1
-                continue
 
-            # Check for last power 's' is obsolete, if we didn't achieve mod_res == n - 1, then
-            # next mod_res isn't 1, so Ferma Little theorem doesn't hold
-            entry_found = False
-            for _ in range(power_s - 1):
-                mod_res = mod_bin_exp(mod_res, 2, odd_n)
-                if mod_res == odd_n - 1:
-                    entry_found = True
-                    break
+# Bit length -> Miller-Rabin rounds for random candidates, FIPS 186-4 Table C.2
+FIPS_ROUNDS = ((1536, 4), (1024, 5), (512, 7))
+DEFAULT_ROUNDS = 40  # Smaller inputs, where the tables give no count
+
+# Every base up to 37 is a proof of primality below 3.3 * 10^24 > 2^64
+DETERMINISTIC_WITNESSES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)
+DETERMINISTIC_LIMIT = 1 << 64
+
+
+@lru_cache(maxsize=None)
+def small_primes(limit=1000):
+    """Primes up to limit by the sieve of Eratosthenes, built once per limit"""
+    raw_nums = bytearray(b"\x01") * (limit + 1)  # +1 for iterating from idx = 2
+    raw_nums[:2] = b"\x00\x00"
+
+    # One of the factors of a composite is <= sqrt(limit)
+    for num in range(2, isqrt(limit) + 1):
+        if raw_nums[num]:
+            # Strike out composites for current prime
+            raw_nums[num * num :: num] = bytes(len(range(num * num, limit + 1, num)))
+
+    return tuple(num for num in range(2, limit + 1) if raw_nums[num])
+
+
+def miller_rabin_rounds(bits):
+    for min_bits, rounds in FIPS_ROUNDS:
+        if bits >= min_bits:
+            return rounds
+    return DEFAULT_ROUNDS
+
+
+def _random_bases(odd_n, rounds):
+    # Get random 'a-base from [2, n - 2]
+    return (secrets.randbelow(odd_n - 4) + 2 for _ in range(rounds))
+
+
+def is_strong_probable_prime(odd_n, bases):
+    """Miller-Rabin: False as soon as one base witnesses that odd_n is composite"""
+    # n - 1 = 2^s * d, s is the number of trailing zero bits
+    power_s = ((odd_n - 1) & (1 - odd_n)).bit_length() - 1
+    odd_d = (odd_n - 1) >> power_s
+
+    for a_base in bases:
+        # Check odd start-number-'d' (built-in pow, windowing does not beat it)
+        mod_res = pow(a_base, odd_d, odd_n)
+        if mod_res == 1 or mod_res == odd_n - 1:
+            # 'n'-candidate passed check, all the other mod results will be = 1
+            continue
+
+        # Check for last power 's' is obsolete, if we didn't achieve mod_res == n - 1, then
+        # next mod_res isn't 1, so Ferma Little theorem doesn't hold
+        for _ in range(power_s - 1):
+            mod_res = mod_res * mod_res % odd_n
+            if mod_res == odd_n - 1:
+                break
+        else:
+            return False
+
+    return True
 
-            if not entry_found:
-                return False
 
+def is_prime(num, rounds=None, deterministic=True):
+    """Primality of any int: trial division, then Miller-Rabin.
+
+    Below 2^64 `deterministic` uses the fixed witnesses and the answer is exact,
+    otherwise `rounds` random bases (default by bit length, see FIPS_ROUNDS).
+    """
+    if num < 2:
+        return False
+
+    primes = small_primes()
+    for small_prime in primes:
+        if num % small_prime == 0:
+            return num == small_prime
+
+    if num <= primes[-1] ** 2:
         return True
 
-    def generate(self):
-        def generate_odd_bit_candidate():
-            bit_num = secrets.randbits(self.num_len)
-            # Make sure the MSB is 1
-            bit_num |= 1 << (self.num_len - 1)
-            # Make the number odd
-            bit_num |= 1
-            return bit_num
-
-        while True:
+    if deterministic and num < DETERMINISTIC_LIMIT:
+        return is_strong_probable_prime(num, DETERMINISTIC_WITNESSES)
+
+    rounds = rounds or miller_rabin_rounds(num.bit_length())
+    return is_strong_probable_prime(num, _random_bases(num, rounds))
+
+
+def _init_search_worker(stop_event):
+    global _stop_event
+    _stop_event = stop_event
+
+
+def _search_worker(generator):
+    return generator._search(_stop_event)
+
+
+class PrimeNumberGenerator:
+    """`workers` > 1 searches in that many processes, the first prime wins.
+
+    `search="incremental"` sieves `sieve_interval` odd numbers after one random
+    start by the primes below `small_prime_limit`, "random" trial-divides a new
+    random candidate every time.
+    """
+
+    def __init__(
+        self,
+        num_len=1024,
+        workers=1,
+        search="random",
+        small_prime_limit=1000,
+        sieve_interval=DEFAULT_SIEVE_INTERVAL,
+    ) -> None:
+        if search not in SEARCH_MODES:
+            raise ValueError(
+                f"Unknown search {search!r}, expected one of {SEARCH_MODES}"
+            )
+
+        self.num_len = num_len
+        self.workers = workers
+        self.search = search
+        self.sieve_interval = sieve_interval
+        self._primes = small_primes(small_prime_limit)
+
+    def _is_prime_by_miller_rabin(self, odd_n, check_iters=None):
+        # Candidates are random, so the FIPS 186-4 counts for num_len apply
+        rounds = check_iters or miller_rabin_rounds(self.num_len)
+        return is_strong_probable_prime(odd_n, _random_bases(odd_n, rounds))
+
+    def _generate_odd_bit_candidate(self):
+        bit_num = secrets.randbits(self.num_len)
+        # Make sure the MSB is 1
+        bit_num |= 1 << (self.num_len - 1)
+        # Make the number odd
+        bit_num |= 1
+        return bit_num
+
+    def _sieve_interval(self, start):
+        """bytearray over start, start + 2, ... - 0 where a small prime divides"""
+        sieve = bytearray(b"\x01") * self.sieve_interval
+        for small_prime in self._primes[1:]:  # Only odd numbers in the interval
+            # start + 2i ≡ 0 (mod p)  =>  i ≡ -start * 2^-1 (mod p)
+            first = (small_prime - start % small_prime) * ((small_prime + 1) // 2)
+            first %= small_prime
+            if start + 2 * first == small_prime:
+                first += small_prime  # The prime itself is not a composite
+            sieve[first::small_prime] = bytes(
+                len(range(first, self.sieve_interval, small_prime))
+            )
+        return sieve
+
+    def _search_incremental(self, stop_event=None):
+        while stop_event is None or not stop_event.is_set():
+            start = self._generate_odd_bit_candidate()
+            sieve = self._sieve_interval(start)
+
+            offset = sieve.find(1)
+            while offset != -1:
+                candidate = start + 2 * offset
+                if candidate.bit_length() > self.num_len:
+                    break  # Interval ran past num_len bits - new start
+                if stop_event is not None and stop_event.is_set():
+                    return None
+
+                if self._is_prime_by_miller_rabin(candidate):
+                    return candidate
+                offset = sieve.find(1, offset + 1)
+
+        return None
+
+    def _search(self, stop_event=None):
+        """Test candidates until a prime is found or stop_event is set"""
+        if self.search == "incremental":
+            return self._search_incremental(stop_event)
+
+        generate_odd_bit_candidate = self._generate_odd_bit_candidate
+
+        while stop_event is None or not stop_event.is_set():
             # 0. Generate odd candidate
             candidate = generate_odd_bit_candidate()
 
@@ -95,3 +202,43 @@ class PrimeNumberGenerator:
             # 2. Heavy check by Miller-Rabin
             if self._is_prime_by_miller_rabin(candidate):
                 return candidate
+
+        return None
+
+    def generate(self):
+        if self.workers == 1:
+            return self._search()
+        return self.generate_many(1)[0]
+
+    def generate_many(self, count):
+        """`count` distinct primes, searched by all workers at once"""
+        if self.workers == 1:
+            primes = set()
+            while len(primes) < count:
+                primes.add(self._search())
+            return list(primes)
+
+        workers = self.workers or os.cpu_count()
+        # Every worker draws its own candidates from `secrets` (os.urandom),
+        # nothing is inherited from the parent, so the streams are independent
+        stop_event = mp.Event()
+        primes = []
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_search_worker, initargs=(stop_event,)
+        ) as pool:
+            pending = {pool.submit(_search_worker, self) for _ in range(workers)}
+            while len(primes) < count:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    prime = future.result()
+                    if prime not in primes and len(primes) < count:
+                        primes.append(prime)
+
+                # Restart the finished searches while primes are still missing
+                for _ in range(min(len(done), count - len(primes))):
+                    pending.add(pool.submit(_search_worker, self))
+
+            # First success cancels the rest
+            stop_event.set()
+
+        return primes
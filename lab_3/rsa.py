@@ -1,13 +1,42 @@
-from euclidean import get_gcd, solve_extended_ea
-from binary_exp import mod_bin_exp
+import secrets
+
+from euclidean import get_gcd, mod_inverse, solve_extended_ea
+from binary_exp import mod_exp
 from prime_generator import PrimeNumberGenerator
 
 
-def generate_key_pair(key_size=2048, pub_exponent=65537):
+class RSAPrivateKey:
+    """Private key with the CRT components, unpacks as (n, e, d) like before"""
+
+    __slots__ = ("n", "e", "d", "p", "q", "dP", "dQ", "qInv")
+
+    def __init__(self, p, q, e, d):
+        self.n = p * q
+        self.e = e
+        self.d = d
+        self.p = p
+        self.q = q
+        # d reduced by (p - 1) and (q - 1) - exponents half the size
+        self.dP = d % (p - 1)
+        self.dQ = d % (q - 1)
+        self.qInv = mod_inverse(q, p)
+
+    def __iter__(self):
+        return iter((self.n, self.e, self.d))
+
+    def __repr__(self):
+        return f"RSAPrivateKey(n={self.n.bit_length()} bits, e={self.e})"
+
+
+def generate_key_pair(key_size=2048, pub_exponent=65537, workers=1):
+    """`workers` > 1 (None - every CPU) searches p and q concurrently"""
     half_size = key_size // 2
-    p = PrimeNumberGenerator(half_size).generate()
+    if workers == 1:
+        p = PrimeNumberGenerator(half_size).generate()
+        q = PrimeNumberGenerator(half_size).generate()
+    else:
+        p, q = PrimeNumberGenerator(half_size, workers).generate_many(2)
     print(f"p = {p}\n")
-    q = PrimeNumberGenerator(half_size).generate()
     print(f"q = {q}\n")
     n = p * q
     print(f"n = {n}\n")
@@ -25,19 +54,46 @@ def generate_key_pair(key_size=2048, pub_exponent=65537):
     if d < 0:
         d = d % phi_n
 
-    return n, e, d
+    return RSAPrivateKey(p, q, e, d)
 
 
 def encrypt(m: int, e, n):
-    return mod_bin_exp(m, e, n)
+    return mod_exp(m, e, n)
 
 
 def decrypt(cipher: int, d, n):
-    return mod_bin_exp(cipher, d, n)
+    return mod_exp(cipher, d, n)
+
+
+def decrypt_crt(cipher: int, key: RSAPrivateKey, blinding=False):
+    """Private operation by the Chinese Remainder Theorem.
+
+    `blinding` multiplies the cipher by r^e for a random r first and divides r
+    out afterwards, so the timing does not depend on the cipher itself.
+    """
+    n = key.n
+    if blinding:
+        while True:
+            r = secrets.randbelow(n - 2) + 2
+            if get_gcd(r, n) == 1:
+                break
+        cipher = cipher * mod_exp(r, key.e, n) % n
+
+    m_p = mod_exp(cipher % key.p, key.dP, key.p)
+    m_q = mod_exp(cipher % key.q, key.dQ, key.q)
+
+    # Garner recombination: m ≡ m_p (mod p), m ≡ m_q (mod q)
+    h = key.qInv * (m_p - m_q) % key.p
+    message = m_q + h * key.q
+
+    if blinding:
+        message = message * mod_inverse(r, n) % n
+    return message
 
 
 if __name__ == "__main__":
-    n, e, d = generate_key_pair()
+    key = generate_key_pair()
+    n, e, d = key
 
     print(f"Public:  e={e}\n")
     print(f"Private: d={d}\n\n")
@@ -47,3 +103,4 @@ if __name__ == "__main__":
     print(encoded)
     decoded = decrypt(cipher=encoded, d=d, n=n)
     print(f"Decoded message = {decoded}")
+    print(f"CRT decoded message = {decrypt_crt(encoded, key, blinding=True)}")
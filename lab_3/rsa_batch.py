@@ -0,0 +1,114 @@
+import os
+import secrets
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from binary_exp import mod_exp
+from rsa import RSAPrivateKey, decrypt_crt
+
+DEFAULT_CHUNK_SIZE = 32  # Messages per pool task
+PKCS1_MIN_PADDING = 8  # Random nonzero bytes at least
+
+
+def pad_block(block: bytes, key_bytes):
+    """PKCS#1 v1.5 encryption padding: 00 02 <random nonzero> 00 <block>"""
+    padding_len = key_bytes - len(block) - 3
+    if padding_len < PKCS1_MIN_PADDING:
+        raise ValueError(
+            f"Block of {len(block)} bytes is too long, "
+            f"at most {key_bytes - 3 - PKCS1_MIN_PADDING} fit a {key_bytes}-byte key"
+        )
+
+    padding = bytes(secrets.randbelow(255) + 1 for _ in range(padding_len))
+    return b"\x00\x02" + padding + b"\x00" + block
+
+
+def unpad_block(padded: bytes):
+    separator = padded.find(b"\x00", 2)
+    if padded[:2] != b"\x00\x02" or separator < 2 + PKCS1_MIN_PADDING:
+        raise ValueError("Decrypted block has invalid padding")
+    return padded[separator + 1 :]
+
+
+def _key_bytes(n):
+    return -(-n.bit_length() // 8)
+
+
+def _encrypt_chunk(task):
+    e, n, messages = task
+    return [mod_exp(m, e, n) for m in messages]
+
+
+def _decrypt_chunk(task):
+    key, ciphers, blinding = task
+    return [decrypt_crt(cipher, key, blinding) for cipher in ciphers]
+
+
+def _chunks(items, chunk_size):
+    items = iter(items)
+    while chunk := list(islice(items, chunk_size)):
+        yield chunk
+
+
+def _ordered_map(func, tasks, workers):
+    """Yields func(task) results in order, at most 2 tasks per worker in flight"""
+    if workers == 1:
+        yield from map(func, tasks)
+        return
+
+    workers = workers or os.cpu_count()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        max_pending = 2 * workers
+        pending = deque()
+        for task in tasks:
+            pending.append(pool.submit(func, task))
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+
+        while pending:
+            yield pending.popleft().result()
+
+
+def encrypt_batch(messages, e, n, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Stream of ciphers for an iterable of message ints, in input order.
+
+    Chunks of `chunk_size` messages are spread over `workers` processes
+    (None - one per CPU, 1 - serial in this process).
+    """
+    tasks = ((e, n, chunk) for chunk in _chunks(messages, chunk_size))
+    for ciphers in _ordered_map(_encrypt_chunk, tasks, workers):
+        yield from ciphers
+
+
+def decrypt_batch(
+    ciphers,
+    key: RSAPrivateKey,
+    workers=None,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    blinding=False,
+):
+    """Stream of messages for an iterable of cipher ints, CRT private operation"""
+    tasks = ((key, chunk, blinding) for chunk in _chunks(ciphers, chunk_size))
+    for messages in _ordered_map(_decrypt_chunk, tasks, workers):
+        yield from messages
+
+
+def encrypt_blocks(blocks, e, n, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """PKCS#1 v1.5 padded byte blocks -> cipher ints"""
+    key_bytes = _key_bytes(n)
+    messages = (int.from_bytes(pad_block(block, key_bytes), "big") for block in blocks)
+    return encrypt_batch(messages, e, n, workers, chunk_size)
+
+
+def decrypt_blocks(
+    ciphers,
+    key: RSAPrivateKey,
+    workers=None,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    blinding=False,
+):
+    """Cipher ints -> original byte blocks, ValueError on broken padding"""
+    key_bytes = _key_bytes(key.n)
+    for message in decrypt_batch(ciphers, key, workers, chunk_size, blinding):
+        yield unpad_block(message.to_bytes(key_bytes, "big"))
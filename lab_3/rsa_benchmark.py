@@ -0,0 +1,60 @@
+import contextlib
+import io
+import os
+import secrets
+import sys
+import time
+
+from rsa import generate_key_pair
+from rsa_batch import decrypt_batch, encrypt_batch
+
+KEY_SIZES = (2048, 4096)
+
+
+def _ops_per_sec(results, count):
+    start = time.perf_counter()
+    out = list(results)
+    return out, count / (time.perf_counter() - start)
+
+
+def benchmark_batch(key_sizes=KEY_SIZES, count=256, workers=None):
+    """Encrypt/decrypt ops/sec of serial vs pooled batches for every key size"""
+    workers = workers or os.cpu_count()
+
+    report = []
+    for key_size in key_sizes:
+        with contextlib.redirect_stdout(io.StringIO()):  # Key generation prints
+            key = generate_key_pair(key_size)
+        messages = [secrets.randbelow(key.n) for _ in range(count)]
+
+        for pool_size in sorted({1, workers}):
+            ciphers, encrypt_ops = _ops_per_sec(
+                encrypt_batch(messages, key.e, key.n, pool_size), count
+            )
+            decoded, decrypt_ops = _ops_per_sec(
+                decrypt_batch(ciphers, key, pool_size), count
+            )
+            if decoded != messages:
+                raise RuntimeError(f"Batch round trip failed at {key_size} bits")
+
+            report.append(
+                {
+                    "key bits": key_size,
+                    "workers": pool_size,
+                    "encrypt ops/s": encrypt_ops,
+                    "decrypt ops/s": decrypt_ops,
+                }
+            )
+
+    return report
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 256
+
+    for row in benchmark_batch(count=count):
+        print(
+            f"{row['key bits']} bits, workers={row['workers']:>2}: "
+            f"encrypt {row['encrypt ops/s']:9.1f} ops/s, "
+            f"decrypt {row['decrypt ops/s']:7.1f} ops/s"
+        )
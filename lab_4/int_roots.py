@@ -0,0 +1,150 @@
+import math
+
+import numpy as np
+
+KARATSUBA_MIN_BITS = 2048  # Smaller inputs go straight to Newton
+
+# Quadratic residues for is_perfect_square, squares hit few of the residues
+_QR_FILTERS = {
+    mod: bytes(
+        1 if any(x * x % mod == r for x in range(mod)) else 0 for r in range(mod)
+    )
+    for mod in (64, 63, 65, 11)
+}
+_QR_PRODUCT = 63 * 65 * 11  # One big-int reduction, the rest on a small int
+
+
+def isqrt_newton(n):
+    """floor(sqrt(n)) by Newton's iteration from 2^ceil(bits/2) >= sqrt(n)"""
+    if n < 0:
+        raise ValueError("Square root of a negative number")
+    if n == 0:
+        return 0
+
+    found_x = 1 << ((n.bit_length() + 1) // 2)
+    while True:
+        new_x = (found_x + (n // found_x)) // 2
+
+        if new_x >= found_x:
+            return found_x
+        found_x = new_x
+
+
+def karatsuba_sqrt(n):
+    """(s, r) with s = floor(sqrt(n)), r = n - s^2, by Zimmermann's SqrtRem.
+
+    The input is split into four k-bit limbs, the root of the top half comes
+    from the recursion and one division gives the low half of the root.
+    """
+    if n < 0:
+        raise ValueError("Square root of a negative number")
+    if n.bit_length() <= KARATSUBA_MIN_BITS:
+        s = isqrt_newton(n)
+        return s, n - s * s
+
+    # Normalize to 4k or 4k - 1 bits (top limb >= 2^k / 4), even shift only
+    k = (n.bit_length() + 3) // 4
+    shift = (4 * k - n.bit_length()) // 2
+    m = n << (2 * shift)
+
+    mask = (1 << k) - 1
+    a1 = (m >> k) & mask
+    a0 = m & mask
+
+    s1, r1 = karatsuba_sqrt(m >> (2 * k))
+    q, u = divmod((r1 << k) | a1, 2 * s1)
+    s = (s1 << k) + q
+    r = (u << k) + a0 - q * q
+    if r < 0:
+        r += 2 * s - 1
+        s -= 1
+
+    if shift:
+        s >>= shift
+        r = n - s * s
+    return s, r
+
+
+def isqrt(n):
+    """floor(sqrt(n)), delegated to math.isqrt.
+
+    The C builtin beats isqrt_newton and karatsuba_sqrt up to tens of thousands
+    of bits, far past the RSA/Pollard sizes, those two stay as worked methods.
+    """
+    return math.isqrt(n)
+
+
+def iroot(n, k):
+    """floor(n^(1/k)), Newton's iteration from 2^ceil(bits/k)"""
+    if k < 1:
+        raise ValueError(f"Root degree must be positive, got {k}")
+    if n < 0:
+        raise ValueError("Root of a negative number")
+    if k == 1 or n < 2:
+        return n
+    if k == 2:
+        return isqrt(n)
+
+    found_x = 1 << -(-n.bit_length() // k)
+    while True:
+        new_x = ((k - 1) * found_x + n // found_x ** (k - 1)) // k
+
+        if new_x >= found_x:
+            return found_x
+        found_x = new_x
+
+
+def is_perfect_square(n):
+    if n < 0:
+        return False
+
+    # Cheap filters first: 64 is a bit mask, the others need one small remainder
+    if not _QR_FILTERS[64][n & 63]:
+        return False
+    residue = n % _QR_PRODUCT
+    for mod in (63, 65, 11):
+        if not _QR_FILTERS[mod][residue % mod]:
+            return False
+
+    root = isqrt(n)
+    return root * root == n
+
+
+def isqrt_array(values):
+    """Vectorized floor(sqrt) of an array of machine-word ints (up to uint64)"""
+    values = np.asarray(values, dtype=np.uint64)
+    # float64 keeps 53 bits, the estimate is off by a few at most - fix it up
+    roots = np.minimum(np.floor(np.sqrt(values.astype(np.float64))), 2**32 - 1)
+    roots = roots.astype(np.uint64)
+
+    while True:
+        too_big = roots * roots > values
+        # (r + 1)^2 overflows uint64 only for r = 2^32 - 1, the largest root
+        too_small = (roots < 2**32 - 1) & ((roots + 1) * (roots + 1) <= values)
+        if not (too_big.any() or too_small.any()):
+            return roots
+        roots = roots - too_big + too_small
+
+
+def is_perfect_square_array(values):
+    values = np.asarray(values, dtype=np.uint64)
+    roots = isqrt_array(values)
+    return roots * roots == values
+
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    for bits in (64, 1024, 4096, 65536):
+        n = random.getrandbits(bits) | (1 << (bits - 1))
+        for func in (isqrt_newton, karatsuba_sqrt, math.isqrt):
+            start = time.perf_counter()
+            func(n)
+            elapsed = time.perf_counter() - start
+            name = f"{func.__module__}.{func.__name__}"
+            print(f"{bits:>6} bits {name:>25}: {elapsed * 1e6:10.1f} us")
+        assert isqrt_newton(n) == karatsuba_sqrt(n)[0] == isqrt(n)
+
+    print(iroot(10**30, 3), is_perfect_square(1025**2), is_perfect_square(1025))
+    print(isqrt_array([0, 1, 1025, 2**64 - 1]))
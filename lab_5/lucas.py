@@ -0,0 +1,203 @@
+from functools import lru_cache
+from math import isqrt
+
+
+@lru_cache(maxsize=None)
+def small_primes(limit=1000):
+    """Primes up to limit by the sieve of Eratosthenes, built once per limit"""
+    raw_nums = bytearray(b"\x01") * (limit + 1)
+    raw_nums[:2] = b"\x00\x00"
+    for num in range(2, isqrt(limit) + 1):
+        if raw_nums[num]:
+            raw_nums[num * num :: num] = bytes(len(range(num * num, limit + 1, num)))
+
+    return tuple(num for num in range(2, limit + 1) if raw_nums[num])
+
+
+def is_perfect_square(n):
+    if n < 0:
+        return False
+    root = isqrt(n)
+    return root * root == n
+
+
+def is_strong_probable_prime(odd_n, bases):
+    """Miller-Rabin: False as soon as one base witnesses that odd_n is composite"""
+    # n - 1 = 2^s * d
+    s = ((odd_n - 1) & (1 - odd_n)).bit_length() - 1
+    d = (odd_n - 1) >> s
+
+    for base in bases:
+        x = pow(base, d, odd_n)
+        if x == 1 or x == odd_n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % odd_n
+            if x == odd_n - 1:
+                break
+        else:
+            return False
+
+    return True
+
+
+def lucas_uv(k, P, Q=1, mod=None):
+    """(U_k, V_k) of the Lucas sequences x_{k+2} = P*x_{k+1} - Q*x_k.
+
+    Doubling over the bits of k, O(log k) steps. The pair (U_k, U_{k+1}) is
+    carried, so no division by 2 is needed and any modulus works:
+        U_2k   = U_k * (2*U_{k+1} - P*U_k)
+        U_2k+1 = U_{k+1}^2 - Q*U_k^2
+        V_k    = 2*U_{k+1} - P*U_k
+    Without mod the values are exact.
+    """
+    if k < 0:
+        raise ValueError("Negative index")
+
+    u, u_next = 0, 1  # U_0, U_1
+    for bit in bin(k)[2:]:
+        u_2k = u * (2 * u_next - P * u)
+        u_2k1 = u_next * u_next - Q * u * u
+        if bit == "1":
+            u, u_next = u_2k1, P * u_2k1 - Q * u_2k
+        else:
+            u, u_next = u_2k, u_2k1
+
+        if mod is not None:
+            u %= mod
+            u_next %= mod
+
+    v = 2 * u_next - P * u
+    return (u, v % mod) if mod is not None else (u, v)
+
+
+def lucas_v(k, P, mod=None):
+    """V_k for Q = 1 by the V-only ladder: V_2k = V_k^2 - 2, V_2k+1 = V_k*V_k+1 - P"""
+    if k < 0:
+        raise ValueError("Negative index")
+
+    v, v_next = 2, P  # V_0, V_1
+    for bit in bin(k)[2:]:
+        if bit == "1":
+            v, v_next = v * v_next - P, v_next * v_next - 2
+        else:
+            v, v_next = v * v - 2, v * v_next - P
+
+        if mod is not None:
+            v %= mod
+            v_next %= mod
+
+    return v
+
+
+def is_mersenne_prime(p):
+    """Lucas-Lehmer test of 2^p - 1: s_0 = 4, s_i+1 = s_i^2 - 2 (= V_2^i(4, 1))"""
+    if p == 2:
+        return True
+    if not is_bpsw_prime(p):
+        return False  # 2^ab - 1 is divisible by 2^a - 1
+
+    mersenne = (1 << p) - 1
+    s = 4
+    for _ in range(p - 2):
+        s = s * s - 2
+        # x mod 2^p - 1 = low p bits + the rest, no division
+        s = (s & mersenne) + (s >> p)
+        s = (s & mersenne) + (s >> p)
+        if s >= mersenne:
+            s -= mersenne
+
+    return s == 0
+
+
+def jacobi(a, n):
+    """Jacobi symbol (a/n), n odd positive"""
+    if n <= 0 or not n & 1:
+        raise ValueError(f"Jacobi symbol needs an odd positive n, got {n}")
+
+    a %= n
+    result = 1
+    while a:
+        # (2/n) = -1 for n ≡ 3, 5 (mod 8)
+        zeros = (a & -a).bit_length() - 1
+        a >>= zeros
+        if zeros & 1 and n & 7 in (3, 5):
+            result = -result
+        # Reciprocity: sign flips when both are ≡ 3 (mod 4)
+        if a & n & 3 == 3:
+            result = -result
+        a, n = n % a, a
+
+    return result if n == 1 else 0
+
+
+def _selfridge_parameters(n):
+    # Method A: first D in 5, -7, 9, -11, ... with (D/n) = -1
+    d = 5
+    while True:
+        symbol = jacobi(d, n)
+        if symbol == -1:
+            return d, 1, (1 - d) // 4
+        if symbol == 0 and abs(d) != n:
+            return None  # gcd(D, n) > 1 - composite
+        d = -d - 2 if d > 0 else -d + 2
+
+
+def is_strong_lucas_prp(n):
+    """Strong Lucas probable prime test with Selfridge's parameters"""
+    if n == 2:
+        return True
+    if n < 2 or not n & 1 or is_perfect_square(n):
+        return False  # Squares never get (D/n) = -1
+
+    params = _selfridge_parameters(n)
+    if params is None:
+        return False
+    _, P, Q = params
+
+    # n + 1 = d * 2^s
+    s = ((n + 1) & -(n + 1)).bit_length() - 1
+    d = (n + 1) >> s
+
+    u, v = lucas_uv(d, P, Q, n)
+    if u == 0 or v == 0:
+        return True
+
+    # V_2k = V_k^2 - 2 Q^k
+    q_k = pow(Q, d, n)
+    for _ in range(s - 1):
+        v = (v * v - 2 * q_k) % n
+        if v == 0:
+            return True
+        q_k = q_k * q_k % n
+
+    return False
+
+
+def is_bpsw_prime(n):
+    """Baillie-PSW: trial division, strong base-2 Miller-Rabin, strong Lucas.
+
+    No composite passing both tests is known.
+    """
+    if n < 2:
+        return False
+    for small_prime in small_primes():
+        if n % small_prime == 0:
+            return n == small_prime
+
+    return is_strong_probable_prime(n, (2,)) and is_strong_lucas_prp(n)
+
+
+if __name__ == "__main__":
+    import time
+
+    # Notebook sequence: d = 3, U_k / V_k for k = 0..9
+    print([lucas_uv(k, 3) for k in range(10)])
+
+    start = time.perf_counter()
+    exponents = [p for p in range(2, 3000) if is_mersenne_prime(p)]
+    print(
+        f"Mersenne exponents below 3000: {exponents} ({time.perf_counter() - start:.2f} s)"
+    )
+
+    print(is_bpsw_prime(2**521 - 1), is_bpsw_prime((2**61 - 1) * (2**89 - 1)))
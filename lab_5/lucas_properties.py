@@ -0,0 +1,199 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_MOD = (1 << 31) - 1  # Prime, products of residues still fit int64
+PROPERTIES = (1, 3, 4, 5, 6, 7, 8)
+
+
+class _Arith:
+    """Elementwise ops on exact object arrays (mod=None) or int64 residues"""
+
+    def __init__(self, mod):
+        self.mod = mod
+        self.dtype = object if mod is None else np.int64
+
+    def array(self, values):
+        values = np.asarray(values, dtype=object)
+        if self.mod is not None:
+            values = values % self.mod
+        return values.astype(self.dtype)
+
+    def reduce(self, values):
+        return values if self.mod is None else values % self.mod
+
+    def zeros(self, shape):
+        return (
+            np.zeros(shape, dtype=self.dtype) if self.mod else np.full(shape, 0, object)
+        )
+
+
+def _lucas_table(arith, ds, k_max):
+    # Rows are k, columns are d: each step is one vector op over all d
+    u = arith.zeros((k_max + 1, len(ds)))
+    v = arith.zeros((k_max + 1, len(ds)))
+    u[0], v[0] = 0, 2
+    if k_max >= 1:
+        u[1], v[1] = 1, ds
+    for k in range(2, k_max + 1):
+        u[k] = arith.reduce(ds * u[k - 1] - u[k - 2])
+        v[k] = arith.reduce(ds * v[k - 1] - v[k - 2])
+    return u, v
+
+
+def _root_powers(arith, ds, disc, k_max, sign):
+    """(d ± sqrt(D))^k = A_k + B_k*sqrt(D) in Z[sqrt(D)], i.e. (2*alpha)^k or (2*beta)^k"""
+    a = arith.zeros((k_max + 1, len(ds)))
+    b = arith.zeros((k_max + 1, len(ds)))
+    a[0] = 1
+    for k in range(k_max):
+        a[k + 1] = arith.reduce(ds * a[k] + sign * disc * b[k])
+        b[k + 1] = arith.reduce(ds * b[k] + sign * a[k])
+    return a, b
+
+
+def _column(values, valid):
+    # Boolean column, NA where the property does not apply to k
+    column = pd.array(np.asarray(values, dtype=bool).ravel(), dtype="boolean")
+    column[~np.asarray(valid).ravel()] = pd.NA
+    return column
+
+
+def verify_properties(ds, k_max=50, mod=DEFAULT_MOD, m=3):
+    """Checks the Lucas sequence properties of the notebook for every d at once.
+
+    Sequences x_k+2 = d*x_k+1 - x_k (Q = 1, D = d^2 - 4) are built for
+    k = 0..k_max as (k, d) arrays, every property is one vectorized comparison
+    over the whole array. mod=None is exact integer arithmetic (object arrays,
+    values grow ~k*log2(d) bits - small k only); a prime mod verifies the
+    identities modulo that prime with int64 arrays, fast enough for k ~ 10^5.
+    Closed forms use exact Z[sqrt(D)] arithmetic scaled by 2^k, no floats.
+
+    Returns (DataFrame indexed by (d, k) with U, V and boolean "Property n"
+    columns, {step: seconds}).
+    """
+    arith = _Arith(mod)
+    ds_raw = list(ds)
+    ds = arith.array(ds_raw)
+    disc = arith.reduce(ds * ds - 4)
+    timings = {}
+
+    def timed(name, func):
+        start = time.perf_counter()
+        result = func()
+        timings[name] = time.perf_counter() - start
+        return result
+
+    u, v = timed("sequences", lambda: _lucas_table(arith, ds, k_max))
+    ks = np.arange(k_max + 1)[:, None]
+    everywhere = np.ones_like(u, dtype=bool)
+    columns = {}
+
+    # 2^k, to compare U, V with the powers of 2*alpha and 2*beta
+    def powers():
+        pow2 = arith.zeros((k_max + 1, 1))
+        pow2[0] = 1
+        for k in range(k_max):
+            pow2[k + 1] = arith.reduce(pow2[k] * 2)
+        alpha = _root_powers(arith, ds, disc, k_max, 1)
+        beta = _root_powers(arith, ds, disc, k_max, -1)
+        return pow2, alpha, beta
+
+    pow2, (a_alpha, b_alpha), (a_beta, b_beta) = timed("root powers", powers)
+
+    def property_1():
+        # 2^k * U_k = ((2a)^k - (2b)^k) / sqrt(D), 2^k * V_k = (2a)^k + (2b)^k
+        u_ok = arith.reduce(pow2 * u - (b_alpha - b_beta)) == 0
+        v_ok = arith.reduce(pow2 * v - (a_alpha + a_beta)) == 0
+        return _column(u_ok & v_ok, everywhere)
+
+    def property_3():
+        # V_k = U_k+1 - U_k-1, k >= 1
+        ok = np.zeros_like(everywhere)
+        ok[1:-1] = arith.reduce(v[1:-1] - (u[2:] - u[:-2])) == 0
+        return _column(ok, (ks >= 1) & (ks < k_max) & everywhere)
+
+    def property_4():
+        # U_k+m = U_k * U_m+1 - U_k-1 * U_m, 1 <= k <= k_max - m
+        ok = np.zeros_like(everywhere)
+        if m + 1 <= k_max:
+            rows = slice(1, k_max - m + 1)
+            lhs = u[1 + m : k_max + 1]
+            rhs = u[rows] * u[m + 1] - u[0 : k_max - m] * u[m]
+            ok[rows] = arith.reduce(lhs - rhs) == 0
+        return _column(ok, (ks >= 1) & (ks <= k_max - m) & everywhere)
+
+    def property_5():
+        # U_2k = U_k * V_k, 2k <= k_max
+        half = k_max // 2 + 1
+        ok = np.zeros_like(everywhere)
+        ok[:half] = arith.reduce(u[0 : 2 * half : 2] - u[:half] * v[:half]) == 0
+        return _column(ok, (2 * ks <= k_max) & everywhere)
+
+    def property_6():
+        # V_2k = V_k^2 - 2
+        half = k_max // 2 + 1
+        ok = np.zeros_like(everywhere)
+        ok[:half] = arith.reduce(v[0 : 2 * half : 2] - (v[:half] * v[:half] - 2)) == 0
+        return _column(ok, (2 * ks <= k_max) & everywhere)
+
+    def property_7():
+        # 2^k (V_k ± U_k sqrt(D)) = 2 (2a)^k and 2 (2b)^k, both parts of Z[sqrt(D)]
+        plus = (arith.reduce(pow2 * v - 2 * a_alpha) == 0) & (
+            arith.reduce(pow2 * u - 2 * b_alpha) == 0
+        )
+        minus = (arith.reduce(pow2 * v - 2 * a_beta) == 0) & (
+            arith.reduce(pow2 * u + 2 * b_beta) == 0
+        )
+        return _column(plus & minus, everywhere)
+
+    def property_8():
+        # U_k+1^2 - d U_k+1 U_k + U_k^2 = 1, any common divisor divides 1
+        ok = np.zeros_like(everywhere)
+        # Reduced product by product, int64 residues must not overflow
+        cassini = (
+            arith.reduce(u[1:] * u[1:])
+            - arith.reduce(arith.reduce(ds * u[1:]) * u[:-1])
+            + arith.reduce(u[:-1] * u[:-1])
+        )
+        ok[:-1] = arith.reduce(cassini - 1) == 0
+        return _column(ok, (ks < k_max) & everywhere)
+
+    checks = {
+        1: property_1,
+        3: property_3,
+        4: property_4,
+        5: property_5,
+        6: property_6,
+        7: property_7,
+        8: property_8,
+    }
+    for number in PROPERTIES:
+        columns[f"Property {number}"] = timed(f"Property {number}", checks[number])
+
+    # Long format: (d, k) index, arrays are (k, d) - transpose before ravel
+    index = pd.MultiIndex.from_product([ds_raw, range(k_max + 1)], names=["d", "k"])
+    df = pd.DataFrame(
+        {
+            "U": u.T.ravel(),
+            "V": v.T.ravel(),
+            **{
+                name: column.reshape(u.shape).T.ravel()
+                for name, column in columns.items()
+            },
+        },
+        index=index,
+    )
+    return df, timings
+
+
+if __name__ == "__main__":
+    df, timings = verify_properties([3, 4, 5, 10], k_max=60, mod=None)
+    print(df.loc[3].head(8))
+    print(df.drop(columns=["U", "V"]).all())
+
+    df, timings = verify_properties(range(3, 13), k_max=10**5)
+    print(df.drop(columns=["U", "V"]).all())
+    for step, seconds in timings.items():
+        print(f"{step:>12}: {seconds * 1e3:8.1f} ms")
@@ -1,48 +1,119 @@
-import matplotlib.pyplot as plt
+import argparse
+import csv
+import sys
+from math import gcd
 
+import numpy as np
 
-def gcd_by_euclid(a, b):
-    while a != 0:
-        b, a = a, b % a
+from prime_sieve import progression_prime_counts, residue_class_counts
 
-    return b
+CSV_CHUNK_ROWS = 1 << 16  # Rows converted to Python objects at a time
 
 
-def is_prime(n):
-    """Check prime"""
-    if n < 2:
-        return False
-    for i in range(2, int(n**0.5) + 1):
-        if n % i == 0:
-            return False
-    return True
+def count_primes_by_dirichlet(a, b, limit_k, step=1):
+    """Cumulative prime counts of a*k + b (every `step`-th k) and the total"""
+    if gcd(a, b) != 1:
+        raise ValueError(f"a={a} and b={b} are not coprime")
 
+    return progression_prime_counts(a, b, limit_k, step)
 
-def count_primes_by_dirichlet(a, b, limit_k):
-    if gcd_by_euclid(a, b) != 1:
-        print("a and b are not coprime")
-        return None, None
 
-    primes_for_k = []
-    total_found = 0
-    for k in range(limit_k):
-        number = a * k + b
-        if is_prime(number):
-            total_found += 1
-        primes_for_k.append(total_found)
-    return primes_for_k, total_found
+def write_csv(dst, x_name, x, columns):
+    """Streams rows x, column values... to a text file-like object.
 
+    columns: {header: counts array}, all of the same length as x. Only
+    CSV_CHUNK_ROWS rows at a time are turned into Python lists.
+    """
+    writer = csv.writer(dst)
+    writer.writerow([x_name, *columns])
+    arrays = [x, *columns.values()]
+    for start in range(0, len(x), CSV_CHUNK_ROWS):
+        chunk = (array[start : start + CSV_CHUNK_ROWS].tolist() for array in arrays)
+        writer.writerows(zip(*chunk))
+
+
+def plot_counts(x, columns, title, xlabel, output=None):
+    """Plots every column, saves to `output` (PNG) without a GUI or shows it"""
+    import matplotlib
+
+    if output is not None:
+        matplotlib.use("Agg")  # Headless, must happen before pyplot is imported
+    import matplotlib.pyplot as plt
 
-a, b, limit = 27, 7, 50000
-res, total_found = count_primes_by_dirichlet(a=a, b=b, limit_k=limit)
-if res:
-    # Отрисовка
     plt.figure(figsize=(10, 6))
-    plt.plot(res, label=f"Progression {a}k + {b}; ", color="blue")
+    for label, counts in columns.items():
+        plt.plot(x, counts, label=label)
 
-    plt.title(f"Primes accumulation (Dirichlet). Total: {total_found}")
-    plt.xlabel("k-value (iteration)")
+    plt.title(title)
+    plt.xlabel(xlabel)
     plt.ylabel("Primes count")
     plt.legend()
     plt.grid(True, linestyle="--", alpha=0.7)
-    plt.show()
+
+    if output is None:
+        plt.show()
+    else:
+        plt.savefig(output, dpi=150)
+        plt.close()
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="Accumulation of primes in arithmetic progressions (Dirichlet)"
+    )
+    parser.add_argument("-a", type=int, default=27, help="progression step")
+    parser.add_argument("-b", type=int, default=7, help="progression start")
+    parser.add_argument("--limit", type=int, default=50000, help="k values to count")
+    parser.add_argument("--step", type=int, default=1, help="keep every step-th k")
+    parser.add_argument(
+        "--all-residues",
+        action="store_true",
+        help="count every class b mod a up to a*limit in one sieve pass",
+    )
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--png", help="save the plot here instead of showing it")
+    parser.add_argument("--csv", help="write the counts as CSV, '-' for stdout")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if args.all_residues:
+        limit = args.a * args.limit
+        residues, x, counts = residue_class_counts(
+            args.a,
+            limit,
+            points=max(1, limit // (args.a * args.step)),
+            workers=args.workers,
+        )
+        columns = {f"{args.a}k + {r}": row for r, row in zip(residues.tolist(), counts)}
+        x_name, xlabel = "n", "n (integers up to)"
+        title = f"Primes by residue mod {args.a} up to {limit}"
+    else:
+        try:
+            counts, total_found = count_primes_by_dirichlet(
+                args.a, args.b, args.limit, args.step
+            )
+        except ValueError as error:
+            parser.error(str(error))
+        columns = {f"Progression {args.a}k + {args.b}": counts}
+        x = np.arange(len(counts)) * args.step
+        x_name, xlabel = "k", "k-value (iteration)"
+        title = f"Primes accumulation (Dirichlet). Total: {total_found}"
+
+    if args.csv == "-":
+        write_csv(sys.stdout, x_name, x, columns)
+    elif args.csv:
+        with open(args.csv, "w", newline="") as f:
+            write_csv(f, x_name, x, columns)
+
+    if args.png or not args.csv:
+        plot_counts(x, columns, title, xlabel, args.png)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,231 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from math import gcd, isqrt
+
+import numpy as np
+
+DEFAULT_SEGMENT_SIZE = 1 << 18  # Booleans per segment, sized to stay in L2 cache
+DEFAULT_POINTS = 1000  # Samples per curve returned for plotting
+TASKS_PER_WORKER = 4  # Smaller ranges balance the load between workers
+
+
+def simple_sieve(limit):
+    """Boolean array is_prime[0..limit] by the plain sieve of Eratosthenes"""
+    is_prime = np.ones(limit + 1, dtype=bool)
+    is_prime[: min(2, limit + 1)] = False
+    for num in range(2, isqrt(limit) + 1):
+        if is_prime[num]:
+            is_prime[num * num :: num] = False
+    return is_prime
+
+
+def primes_up_to(limit):
+    return np.flatnonzero(simple_sieve(limit))
+
+
+def segmented_sieve(low, high, segment_size=DEFAULT_SEGMENT_SIZE):
+    """Yields (segment start, is_prime) for [low, high) one segment at a time.
+
+    Only the base primes up to sqrt(high) and one segment are in memory.
+    """
+    base_primes = primes_up_to(isqrt(max(high - 1, 0)))
+
+    for seg_low in range(low, high, segment_size):
+        seg_high = min(seg_low + segment_size, high)
+        is_prime = np.ones(seg_high - seg_low, dtype=bool)
+
+        for prime in base_primes.tolist():
+            # First multiple in the segment, the prime itself is not struck out
+            start = max(prime * prime, -(-seg_low // prime) * prime)
+            if start >= seg_high:
+                if prime * prime >= seg_high:
+                    break
+                continue
+            is_prime[start - seg_low :: prime] = False
+
+        # 0 and 1 are not primes
+        is_prime[: max(0, min(2, seg_high) - seg_low)] = False
+        yield seg_low, is_prime
+
+
+def progression_sieve(a, b, limit_k, segment_size=DEFAULT_SEGMENT_SIZE):
+    """Yields (k start, is_prime) for a*k + b, k in [0, limit_k), by segments of k.
+
+    Composites are struck out directly on k: for every base prime p not
+    dividing a, a*k + b ≡ 0 (mod p) exactly for k ≡ -b * a^-1 (mod p).
+    Primes dividing a are never struck, so a and b must be coprime.
+    """
+    if a < 1 or b < 0:
+        raise ValueError(f"Expected a >= 1 and b >= 0, got a={a}, b={b}")
+    if gcd(a, b) != 1:
+        raise ValueError(f"a={a} and b={b} are not coprime")
+    return _progression_segments(a, b, limit_k, segment_size)
+
+
+def _progression_segments(a, b, limit_k, segment_size):
+    if limit_k <= 0:
+        return
+
+    max_value = a * (limit_k - 1) + b
+    base_primes = [p for p in primes_up_to(isqrt(max_value)).tolist() if a % p]
+
+    # First k with p | a*k + b and a value past p itself - a true composite
+    first_k = []
+    for prime in base_primes:
+        k = -b * pow(a, -1, prime) % prime
+        while a * k + b <= prime:
+            k += prime
+        first_k.append(k)
+    primes = np.array(base_primes, dtype=np.int64)
+    first_k = np.array(first_k, dtype=np.int64)
+    k_two = max(0, -(-(2 - b) // a))  # First k with a*k + b >= 2
+
+    for k_low in range(0, limit_k, segment_size):
+        k_high = min(k_low + segment_size, limit_k)
+        is_prime = np.ones(k_high - k_low, dtype=bool)
+
+        # Offset of the first marked k inside this segment, for every prime
+        offsets = np.where(
+            first_k >= k_low, first_k - k_low, (first_k - k_low) % primes
+        )
+        for prime, offset in zip(primes.tolist(), offsets.tolist()):
+            is_prime[offset::prime] = False
+
+        # Values below 2 are not primes
+        is_prime[: max(0, min(k_two, k_high) - k_low)] = False
+
+        yield k_low, is_prime
+
+
+def progression_prime_counts(a, b, limit_k, step=1, segment_size=DEFAULT_SEGMENT_SIZE):
+    """Cumulative prime counts of a*k + b over k, taken at every `step`-th k.
+
+    counts[i] is the number of primes among k = 0 .. i*step. step=1 is the
+    full curve, a larger step keeps memory bounded for huge limit_k.
+    """
+    counts = []
+    total = 0
+    for k_low, is_prime in progression_sieve(a, b, limit_k, segment_size):
+        running = np.cumsum(is_prime, dtype=np.int64) + total
+        # Global indices k ≡ 0 (mod step) inside this segment
+        counts.append(running[(-k_low) % step :: step])
+        total = int(running[-1])
+
+    if not counts:
+        return np.zeros(0, dtype=np.int64), 0
+    return np.concatenate(counts), total
+
+
+def _count_range(task):
+    # Histogram of the primes in [low, high) by (residue class, sample bin)
+    low, high, modulus, step, segment_size = task
+    class_of = np.full(modulus, -1, dtype=np.int64)
+    residues = [r for r in range(modulus) if gcd(r, modulus) == 1]
+    class_of[residues] = np.arange(len(residues))
+
+    first_bin = low // step
+    bins = (high - 1) // step - first_bin + 1
+    hist = np.zeros(len(residues) * bins, dtype=np.int64)
+
+    for seg_low, is_prime in segmented_sieve(low, high, segment_size):
+        primes = np.flatnonzero(is_prime) + seg_low
+        classes = class_of[primes % modulus]
+        coprime = classes >= 0  # Primes dividing the modulus are in no class
+        flat = classes[coprime] * bins + (primes[coprime] // step - first_bin)
+        hist += np.bincount(flat, minlength=hist.size)
+
+    return first_bin, hist.reshape(len(residues), bins)
+
+
+def _run(func, tasks, workers):
+    if workers == 1 or len(tasks) <= 1:
+        return [func(task) for task in tasks]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(func, tasks))
+
+
+def residue_class_counts(
+    modulus,
+    limit,
+    points=DEFAULT_POINTS,
+    workers=None,
+    segment_size=DEFAULT_SEGMENT_SIZE,
+):
+    """Prime counts of all phi(modulus) classes r mod modulus, one sieve pass.
+
+    Integers below `limit` are sieved once, in ranges spread over `workers`
+    processes (None - every CPU, 1 - in this process), and every prime goes to
+    the bucket of its residue. Returns (residues, x, counts): counts[i, j] is
+    the number of primes p < x[j] with p ≡ residues[i] (mod modulus), sampled
+    at about `points` x values up to limit.
+    """
+    residues = np.array([r for r in range(modulus) if gcd(r, modulus) == 1])
+    step = max(1, -(-limit // points))
+    bins = -(-limit // step)
+
+    workers = workers or os.cpu_count()
+    range_len = max(segment_size, -(-limit // (workers * TASKS_PER_WORKER)))
+    tasks = [
+        (low, min(low + range_len, limit), modulus, step, segment_size)
+        for low in range(0, limit, range_len)
+    ]
+
+    hist = np.zeros((len(residues), bins), dtype=np.int64)
+    for first_bin, part in _run(_count_range, tasks, workers):
+        hist[:, first_bin : first_bin + part.shape[1]] += part
+
+    # Compact result: counts below limit fit 32 bits for any practical limit
+    dtype = np.uint32 if limit < 1 << 32 else np.int64
+    counts = np.cumsum(hist, axis=1).astype(dtype)
+    x = np.minimum(np.arange(1, bins + 1) * step, limit)
+    return residues, x, counts
+
+
+def check_against_simple_sieve(
+    a_values=(1, 2, 3, 4, 6, 10, 27, 30), b_values=range(31), limit_ks=(0, 1, 50, 333)
+):
+    """Compares progression_sieve/progression_prime_counts with simple_sieve.
+
+    Every coprime (a, b) in the grid is checked for every limit_k with segment
+    sizes that split it in different places; pairs with a common factor must
+    raise ValueError. Returns the number of checked cases.
+    """
+    checked = 0
+    for a in a_values:
+        for b in b_values:
+            if gcd(a, b) != 1:
+                try:
+                    progression_sieve(a, b, 10)
+                except ValueError:
+                    checked += 1
+                    continue
+                raise AssertionError(f"No ValueError for a={a}, b={b}")
+
+            for limit_k in limit_ks:
+                values = a * np.arange(limit_k) + b
+                expected = simple_sieve(a * limit_k + b)[values]
+                for segment_size in (1, 7, 64, DEFAULT_SEGMENT_SIZE):
+                    parts = [
+                        is_prime
+                        for _, is_prime in progression_sieve(
+                            a, b, limit_k, segment_size
+                        )
+                    ]
+                    got = np.concatenate(parts) if parts else np.zeros(0, bool)
+                    assert np.array_equal(got, expected), (a, b, limit_k, segment_size)
+
+                    for step in (1, 5):
+                        counts, total = progression_prime_counts(
+                            a, b, limit_k, step, segment_size
+                        )
+                        running = np.cumsum(expected, dtype=np.int64)
+                        assert total == int(expected.sum()), (a, b, limit_k, step)
+                        assert np.array_equal(counts, running[::step]), (a, b, step)
+                    checked += 1
+
+    return checked
+
+
+if __name__ == "__main__":
+    print(f"progression sieve: {check_against_simple_sieve()} cases match simple_sieve")
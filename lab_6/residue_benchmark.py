@@ -0,0 +1,44 @@
+import os
+import sys
+import time
+
+import numpy as np
+
+from prime_sieve import progression_prime_counts, residue_class_counts
+
+
+def compare_residue_counting(modulus, limit, workers=None):
+    """Seconds for all residue classes: one progression sieve per class vs one
+    batch pass, serial and over worker processes. Totals are cross-checked"""
+    start = time.perf_counter()
+    per_class = {}
+    for residue in range(modulus):
+        if np.gcd(residue, modulus) == 1:
+            limit_k = -(-(limit - residue) // modulus)
+            _, per_class[residue] = progression_prime_counts(
+                modulus, residue, limit_k, step=limit_k or 1
+            )
+    report = [{"method": "per class", "seconds": time.perf_counter() - start}]
+
+    for pool_size in sorted({1, workers or os.cpu_count()}):
+        start = time.perf_counter()
+        residues, _, counts = residue_class_counts(modulus, limit, workers=pool_size)
+        elapsed = time.perf_counter() - start
+
+        totals = dict(zip(residues.tolist(), counts[:, -1].tolist()))
+        if totals != per_class:
+            raise RuntimeError("Batch counts differ from per-class counts")
+        report.append({"method": f"batch, workers={pool_size}", "seconds": elapsed})
+
+    return report, per_class
+
+
+if __name__ == "__main__":
+    modulus = int(sys.argv[1]) if len(sys.argv) > 1 else 27
+    limit = int(sys.argv[2]) if len(sys.argv) > 2 else 10**8
+
+    report, totals = compare_residue_counting(modulus, limit)
+    for row in report:
+        print(f"{row['method']:>20}: {row['seconds']:.2f} s")
+    for residue, total in totals.items():
+        print(f"{modulus}k + {residue}: {total}")
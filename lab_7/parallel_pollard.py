@@ -0,0 +1,137 @@
+import multiprocessing as mp
+import os
+import random
+import secrets
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from pollard import (
+    DEFAULT_ATTEMPTS,
+    DEFAULT_BATCH,
+    brent_rho,
+    factorize,
+    is_prime,
+    random_prime,
+)
+
+_stop_event = None  # Set in walk workers, tells them to give up
+
+
+def _init_walk_worker(stop_event):
+    global _stop_event
+    _stop_event = stop_event
+
+
+def _walk_worker(task):
+    # Independent walks (new x0 and c every time) until a factor, the stop
+    # or max_walks walks without a factor
+    n, walk_seed, batch, max_walks = task
+    rng = random.Random(walk_seed)
+    stats = {"pid": os.getpid(), "walks": 0, "steps": 0, "factor": None}
+
+    start = time.perf_counter()
+    while stats["walks"] < max_walks and not _stop_event.is_set():
+        factor, steps = brent_rho(
+            n,
+            rng.randrange(2, n),
+            rng.randrange(1, n - 2),
+            batch,
+            stop_event=_stop_event,
+        )
+        stats["walks"] += 1
+        stats["steps"] += steps
+        if factor is not None:
+            stats["factor"] = factor
+            break
+
+    stats["seconds"] = time.perf_counter() - start
+    return stats
+
+
+def parallel_find_factor(
+    n, workers=None, batch=DEFAULT_BATCH, max_walks=DEFAULT_ATTEMPTS
+):
+    """Proper factor of a composite n by rho walks in `workers` processes.
+
+    Every worker runs its own stream of at most `max_walks` walks (seeded from
+    `secrets`). The first factor wins and an Event stops the others within one
+    batch. Returns (factor, per-worker stats: pid, walks, steps, seconds, factor).
+    Raises RuntimeError like find_factor when every worker runs out of walks.
+    """
+    if n < 4 or is_prime(n):
+        raise ValueError(f"{n} is not composite, there is no proper factor")
+    if n % 2 == 0:
+        return 2, []
+
+    workers = workers or os.cpu_count()
+    stop_event = mp.Event()
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_walk_worker, initargs=(stop_event,)
+    ) as pool:
+        pending = {
+            pool.submit(_walk_worker, (n, secrets.randbits(64), batch, max_walks))
+            for _ in range(workers)
+        }
+
+        factor = None
+        stats = []
+        while factor is None and pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                stats.append(future.result())
+                factor = factor or stats[-1]["factor"]
+
+        # First result cancels the rest, their stats are still collected
+        stop_event.set()
+        for future in pending:
+            stats.append(future.result())
+
+    if factor is None:
+        raise RuntimeError(
+            f"No factor of {n} found in {workers} workers x {max_walks} walks"
+        )
+    return factor, stats
+
+
+def factorize_batch(numbers, workers=None):
+    """factorize() every number across a process pool, results in input order.
+
+    Largest numbers are submitted first so the long jobs do not end up alone
+    at the tail while the other cores idle.
+    """
+    numbers = list(numbers)
+    order = sorted(range(len(numbers)), key=lambda i: -numbers[i].bit_length())
+
+    if workers == 1 or len(numbers) <= 1:
+        return [factorize(num) for num in numbers]
+
+    results = [None] * len(numbers)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(factorize, numbers[i]): i for i in order}
+        for future, i in futures.items():
+            results[i] = future.result()
+
+    return results
+
+
+if __name__ == "__main__":
+    p = random_prime(40)
+    q = random_prime(40)
+
+    start = time.perf_counter()
+    factor, stats = parallel_find_factor(p * q)
+    print(
+        f"{p * q} = {factor} * {p * q // factor} in {time.perf_counter() - start:.2f} s"
+    )
+    for row in stats:
+        print(
+            f"  worker {row['pid']}: {row['walks']} walks, {row['steps']} steps, "
+            f"{row['seconds']:.2f} s, factor {row['factor']}"
+        )
+
+    batch = [random_prime(30) * random_prime(30)]
+    batch += [2**64 + 1, 1022, 10**18 + 9]
+    start = time.perf_counter()
+    for num, factors in zip(batch, factorize_batch(batch)):
+        print(f"{num}: {factors}")
+    print(f"Batch: {time.perf_counter() - start:.2f} s")
@@ -0,0 +1,178 @@
+import random
+from functools import lru_cache
+from math import gcd, isqrt
+
+DEFAULT_BATCH = 128  # Steps multiplied together per GCD
+DEFAULT_ATTEMPTS = 64  # Seeds/constants tried before giving up
+
+# Bases up to 41 prove primality below 3.3 * 10^24, random ones are used above
+DETERMINISTIC_WITNESSES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+DETERMINISTIC_LIMIT = 3_317_044_064_679_887_385_961_981
+RANDOM_ROUNDS = 32
+
+
+@lru_cache(maxsize=None)
+def small_primes(limit=1000):
+    """Primes up to limit by the sieve of Eratosthenes, built once per limit"""
+    raw_nums = bytearray(b"\x01") * (limit + 1)
+    raw_nums[:2] = b"\x00\x00"
+    for num in range(2, isqrt(limit) + 1):
+        if raw_nums[num]:
+            raw_nums[num * num :: num] = bytes(len(range(num * num, limit + 1, num)))
+
+    return tuple(num for num in range(2, limit + 1) if raw_nums[num])
+
+
+def is_prime(num):
+    """Trial division, then Miller-Rabin - exact below DETERMINISTIC_LIMIT"""
+    if num < 2:
+        return False
+    primes = small_primes()
+    for small_prime in primes:
+        if num % small_prime == 0:
+            return num == small_prime
+    if num <= primes[-1] ** 2:
+        return True
+
+    if num < DETERMINISTIC_LIMIT:
+        bases = DETERMINISTIC_WITNESSES
+    else:
+        bases = [random.randrange(2, num - 1) for _ in range(RANDOM_ROUNDS)]
+
+    # n - 1 = 2^s * d
+    s = ((num - 1) & (1 - num)).bit_length() - 1
+    d = (num - 1) >> s
+    for base in bases:
+        x = pow(base, d, num)
+        if x == 1 or x == num - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % num
+            if x == num - 1:
+                break
+        else:
+            return False
+
+    return True
+
+
+def random_prime(bits, rng=None):
+    """Random prime with exactly `bits` bits, for the demos"""
+    rng = rng or random.Random()
+    while True:
+        candidate = rng.getrandbits(bits) | (1 << (bits - 1)) | 1
+        if is_prime(candidate):
+            return candidate
+
+
+def brent_rho(n, seed=2, c=1, batch=DEFAULT_BATCH, max_steps=None, stop_event=None):
+    """One Pollard rho run on x -> x^2 + c (mod n) with Brent's cycle detection.
+
+    |x - y| products are accumulated over `batch` steps and reduced by one GCD.
+    When a batch collapses to n, its steps are replayed one GCD at a time.
+    Returns (factor or None, steps); None when the cycle closes without a
+    proper factor, max_steps is exceeded or stop_event is set (checked once
+    per batch) - retry with another seed/c.
+    """
+    y = seed % n
+    power = 1  # Length of the current Brent segment
+    product = 1
+    factor = 1
+    steps = 0
+
+    while factor == 1:
+        x = y  # Saved at every power of two
+        for _ in range(power):
+            y = (y * y + c) % n
+        steps += power
+
+        done = 0
+        while done < power and factor == 1:
+            y_saved = y
+            block = min(batch, power - done)
+            for _ in range(block):
+                y = (y * y + c) % n
+                product = product * abs(x - y) % n
+            factor = gcd(product, n)
+            done += block
+            steps += block
+
+            if factor == 1 and stop_event is not None and stop_event.is_set():
+                return None, steps
+
+        if factor == n:
+            # Backtrack through the batch that swallowed the factor
+            y = y_saved
+            factor = 1
+            while factor == 1:
+                y = (y * y + c) % n
+                factor = gcd(abs(x - y), n)
+            break
+
+        power *= 2
+        if max_steps is not None and steps > max_steps:
+            return None, steps
+
+    return (factor if factor != n else None), steps
+
+
+def find_factor(n, attempts=DEFAULT_ATTEMPTS, rng=None, batch=DEFAULT_BATCH):
+    """Proper factor of a composite n, restarting rho with new seeds/constants"""
+    if n % 2 == 0:
+        return 2
+
+    rng = rng or random.Random()
+    for _ in range(attempts):
+        # c = 0 and c = -2 give degenerate maps
+        seed = rng.randrange(2, n)
+        c = rng.randrange(1, n - 2)
+        factor, _ = brent_rho(n, seed, c, batch)
+        if factor is not None:
+            return factor
+
+    raise RuntimeError(f"No factor of {n} found in {attempts} attempts")
+
+
+def factorize(n, rng=None):
+    """Sorted prime factors with multiplicity: trial division, Miller-Rabin, rho"""
+    if n < 1:
+        raise ValueError(f"Only positive numbers are factorized, got {n}")
+
+    factors = []
+    for small_prime in small_primes():
+        if small_prime * small_prime > n:
+            break
+        while n % small_prime == 0:
+            factors.append(small_prime)
+            n //= small_prime
+
+    pending = [n] if n > 1 else []
+    while pending:
+        num = pending.pop()
+        if is_prime(num):
+            factors.append(num)
+            continue
+
+        # Rho is slow on squares of primes, take the root directly
+        root = isqrt(num)
+        if root * root == num:
+            pending += [root, root]
+            continue
+
+        factor = find_factor(num, rng=rng)
+        pending += [factor, num // factor]
+
+    return sorted(factors)
+
+
+if __name__ == "__main__":
+    import time
+
+    print(factorize(1022), factorize(2**64 + 1), factorize(3**4 * 101**2 * 1009))
+
+    for bits in (60, 70, 80):
+        p = random_prime(bits // 2)
+        q = random_prime(bits // 2)
+        start = time.perf_counter()
+        factors = factorize(p * q)
+        print(f"{bits}-bit semiprime: {factors} in {time.perf_counter() - start:.2f} s")